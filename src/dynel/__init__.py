@@ -20,6 +20,7 @@ from .logging_utils import (
     global_exception_handler
 )
 from .exception_handling import (
+    close_mirror_handlers,
     handle_exception,
     module_exception_handler
 )
@@ -36,6 +37,7 @@ __all__ = [
     "configure_logging",
     "global_exception_handler",
     # From exception_handling
+    "close_mirror_handlers",
     "handle_exception",
     "module_exception_handler",
     # From cli
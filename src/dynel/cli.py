@@ -1,4 +1,5 @@
 import argparse
+import functools
 from typing import Any, Dict
 
 # logger will be used from loguru, configured by configure_logging
@@ -14,23 +15,16 @@ from .exception_handling import handle_exception
 # from .logging_utils import configure_logging # Removed as it's now in .dynel
 
 
-def parse_command_line_args() -> dict[str, Any]:  # Python 3.9+
+@functools.cache
+def _build_parser() -> argparse.ArgumentParser:
     """
-    Parses command-line arguments for DynEL configuration.
+    Builds the argument parser used by :func:`parse_command_line_args`.
 
-    Defines and parses the following arguments:
-    - ``--context-level``: Sets the logging context level.
-      Choices: 'min', 'minimal', 'med', 'medium', 'det', 'detailed'.
-    - ``--debug``: Enables debug mode (sets log level to DEBUG).
-    - ``--no-formatting``: Disables special log formatting.
+    Built on first use and cached; ``parse_args()`` does not mutate the
+    parser, so it can be reused.
 
-    These arguments can be used to override settings from configuration files
-    or default initializations when DynEL is run or integrated in a way that
-    parses command-line arguments (e.g., via its ``if __name__ == "__main__":`` block).
-
-    :return: A dictionary containing the parsed command-line arguments.
-             Keys are 'context_level', 'debug', and 'formatting'.
-    :rtype: Dict[str, Any]
+    :return: The configured argument parser.
+    :rtype: argparse.ArgumentParser
     """
     parser = argparse.ArgumentParser(description="DynEL Error Logging Configuration")
     parser.add_argument(
@@ -54,7 +48,28 @@ def parse_command_line_args() -> dict[str, Any]:  # Python 3.9+
         dest="formatting",
         help="Disable special formatting",
     )
-    args = parser.parse_args()
+    return parser
+
+
+def parse_command_line_args() -> dict[str, Any]:  # Python 3.9+
+    """
+    Parses command-line arguments for DynEL configuration.
+
+    Defines and parses the following arguments:
+    - ``--context-level``: Sets the logging context level.
+      Choices: 'min', 'minimal', 'med', 'medium', 'det', 'detailed'.
+    - ``--debug``: Enables debug mode (sets log level to DEBUG).
+    - ``--no-formatting``: Disables special log formatting.
+
+    These arguments can be used to override settings from configuration files
+    or default initializations when DynEL is run or integrated in a way that
+    parses command-line arguments (e.g., via its ``if __name__ == "__main__":`` block).
+
+    :return: A dictionary containing the parsed command-line arguments.
+             Keys are 'context_level', 'debug', and 'formatting'.
+    :rtype: Dict[str, Any]
+    """
+    args = _build_parser().parse_args()
     return {
         "context_level": args.context_level,
         "debug": args.debug,
@@ -1,13 +1,77 @@
+import builtins
+import functools
 import importlib
 import json
+import os
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Type, Union # Keep Dict, List, Optional, Type, Union for <3.9 compatibility
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Type, Union # Keep Dict, List, Optional, Type, Union for <3.9 compatibility
 
-import toml
-import yaml
 from loguru import logger
 
+try:
+    from orjson import loads as _json_loads # Optional, faster JSON parsing
+except ImportError:
+    from json import loads as _json_loads
+
+
+# Validated settings from configuration files keyed by resolved path, stored
+# with the (st_mtime_ns, st_size) they were read at and the (logger method,
+# message) diagnostics validation produced, which every load re-emits. Editing
+# a file changes its mtime or size, and the next load replaces that path's entry.
+_CONFIG_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any], Tuple[Tuple[str, str], ...]]] = {}
+
+
+class _ResolveError(Exception):
+    """Raised when a configured exception name cannot be resolved to an exception class."""
+
+
+@functools.lru_cache(maxsize=512)
+def _resolve_exception_class(exception_str: str) -> Tuple[Optional[Type[BaseException]], Optional[str]]:
+    """
+    Resolves an exception name from a configuration file to its class.
+
+    Builtin names (e.g. ``"ValueError"``) are looked up first without any
+    import; dotted names (e.g. ``"mypackage.errors.MyError"``) are imported.
+    Results are memoized, including failures, so repeated names across
+    functions and config reloads skip the import machinery.
+
+    :param exception_str: The exception name as written in the config file.
+    :type exception_str: str
+    :return: ``(exception_class, None)`` on success, or ``(None, error_message)``
+             if the name cannot be resolved to a :class:`BaseException` subclass.
+    :rtype: Tuple[Optional[Type[BaseException]], Optional[str]]
+    """
+    exception_class_val: Any = builtins.__dict__.get(exception_str)
+    try:
+        if not (isinstance(exception_class_val, type) and issubclass(exception_class_val, BaseException)):
+            module_name, sep, class_name = exception_str.rpartition('.')
+            if sep:
+                module = importlib.import_module(module_name)
+                exception_class_val = getattr(module, class_name)
+        if not (isinstance(exception_class_val, type) and issubclass(exception_class_val, BaseException)):
+            raise TypeError(f"'{exception_str}' is not a BaseException subclass.")
+    except (AttributeError, ImportError, ValueError, TypeError) as e:
+        return None, str(e)
+    return exception_class_val, None
+
+
+def _resolve_exception(exception_str: str) -> Type[BaseException]:
+    """
+    Returns the exception class named by ``exception_str``.
+
+    :param exception_str: The exception name as written in the config file.
+    :type exception_str: str
+    :return: The resolved exception class.
+    :rtype: Type[BaseException]
+    :raises _ResolveError: If the name cannot be resolved to a :class:`BaseException` subclass.
+    """
+    exception_class_val, error_msg = _resolve_exception_class(exception_str)
+    if exception_class_val is None:
+        raise _ResolveError(error_msg)
+    return exception_class_val
+
 
 class ContextLevel(Enum):
     """
@@ -59,14 +123,28 @@ class DynelConfig:
     :vartype PANIC_MODE: bool
     :ivar EXCEPTION_CONFIG: A dictionary mapping function names to their specific
                             exception handling configurations (e.g., custom messages, tags).
-                            Loaded from external configuration files.
-    :vartype EXCEPTION_CONFIG: dict[str, dict[str, Any]]
+                            Loaded from external configuration files; loaded entries are
+                            read-only mappings (with tuple ``exceptions`` and ``tags``)
+                            shared between loads of the same file.
+    :vartype EXCEPTION_CONFIG: dict[str, Mapping[str, Any]]
     :ivar LOG_FORMAT: The primary log format string for general logging.
     :vartype LOG_FORMAT: str
     :ivar AUX_LOG_FORMAT: The log format string for auxiliary logs (e.g., specific error files).
                          Defaults to a simpler format if not specified.
     :vartype AUX_LOG_FORMAT: str
     """
+    __slots__ = (
+        "CONTEXT_LEVEL_MAP",
+        "CUSTOM_CONTEXT_LEVEL",
+        "DEBUG_MODE",
+        "FORMATTING_ENABLED",
+        "PANIC_MODE",
+        "LOG_FORMAT",
+        "AUX_LOG_FORMAT",
+        "EXCEPTION_CONFIG",
+        "_env_snapshot",
+    )
+
     DEFAULT_LOG_FORMAT = (
         "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
         "<level>{level: <8}</level> | "
@@ -109,58 +187,152 @@ class DynelConfig:
         self.PANIC_MODE = panic_mode
         self.LOG_FORMAT = log_format if log_format is not None else self.DEFAULT_LOG_FORMAT
         self.AUX_LOG_FORMAT = aux_log_format if aux_log_format is not None else self.DEFAULT_AUX_LOG_FORMAT
-        self.EXCEPTION_CONFIG: Dict[str, Dict[str, Any]] = {}
+        self.EXCEPTION_CONFIG: Dict[str, Mapping[str, Any]] = {}
+        self._env_snapshot: Optional[Dict[str, str]] = None
 
-    def load_exception_config(self, filename_prefix: str = "dynel_config", supported_extensions: Optional[List[str]] = None) -> None:
+    def env_snapshot(self) -> Dict[str, str]:
+        """
+        Returns the environment variables logged at the DETAILED context level.
+
+        The environment is read on first use and kept, so handling an exception
+        does not re-read ``os.environ``. Each call returns a fresh copy of that
+        snapshot, since it is bound into log records that sinks may modify.
+        Call :meth:`refresh_env_snapshot` after changing the environment.
+
+        :return: A copy of ``os.environ`` as it was on first use.
+        :rtype: Dict[str, str]
+        """
+        if self._env_snapshot is None:
+            self._env_snapshot = dict(os.environ)
+        return dict(self._env_snapshot)
+
+    def refresh_env_snapshot(self) -> None:
+        """Discards the cached environment so the next :meth:`env_snapshot` re-reads it."""
+        self._env_snapshot = None
+
+    def reset(self) -> None:
+        """
+        Restores the default settings on this instance.
+
+        Clears any loaded exception configuration and environment snapshot and
+        resets context level, debug, formatting, panic mode and log formats to
+        their defaults, so a single instance can be reused instead of
+        constructing a new one.
+        """
+        self.CUSTOM_CONTEXT_LEVEL = ContextLevel.MINIMAL
+        self.DEBUG_MODE = False
+        self.FORMATTING_ENABLED = True
+        self.PANIC_MODE = False
+        self.LOG_FORMAT = self.DEFAULT_LOG_FORMAT
+        self.AUX_LOG_FORMAT = self.DEFAULT_AUX_LOG_FORMAT
+        self.EXCEPTION_CONFIG = {}
+        self._env_snapshot = None
+
+    def load_exception_config(self, filename_prefix: str = "dynel_config", supported_extensions: Optional[List[str]] = None, *, search_dir: Optional[Union[str, Path]] = None) -> None:
         """
         Loads exception handling configurations from a file.
         Also loads 'LOG_FORMAT' and 'AUX_LOG_FORMAT' if present at the root of the config file.
+
+        The file ``<filename_prefix>.<ext>`` is looked up in ``search_dir`` if given,
+        otherwise in the current working directory.
         """
         if supported_extensions is None:
             supported_extensions = ["json", "yaml", "yml", "toml"]
 
-        config_file_found = self._find_config_file(filename_prefix, supported_extensions)
-        raw_config = self._load_config_file(config_file_found)
-        self._validate_config_dict(raw_config, config_file_found)
+        config_file_found = self._find_config_file(filename_prefix, supported_extensions, search_dir)
+        stat_result = config_file_found.stat()
+        cache_key = str(config_file_found.resolve())
+        file_version = (stat_result.st_mtime_ns, stat_result.st_size)
+        cached = _CONFIG_CACHE.get(cache_key)
+        if cached is not None and cached[0] == file_version:
+            _, settings, diagnostics = cached
+        else:
+            settings, diagnostics = self._read_config_settings(config_file_found)
+            _CONFIG_CACHE[cache_key] = (file_version, settings, diagnostics)
+        # A cached file was validated earlier; warn about its invalid entries on every load
+        for level, message in diagnostics:
+            getattr(logger, level)(message)
+
+        if "debug_mode" in settings:
+            self.DEBUG_MODE = settings["debug_mode"]
+        if "LOG_FORMAT" in settings:
+            self.LOG_FORMAT = settings["LOG_FORMAT"]
+        if "AUX_LOG_FORMAT" in settings:
+            self.AUX_LOG_FORMAT = settings["AUX_LOG_FORMAT"]
+        # Per-function entries are read-only, so every load can share them; only the
+        # top-level dict is copied so callers may still add or drop functions.
+        self.EXCEPTION_CONFIG = dict(settings["EXCEPTION_CONFIG"])
+
+    @classmethod
+    def clear_load_cache(cls) -> None:
+        """
+        Discards cached configuration files and resolved exception names.
 
-        # Normalize top-level keys for specific lookups to make them case-insensitive from file
-        upper_raw_config = {k.upper(): v for k, v in raw_config.items()}
+        :meth:`load_exception_config` only re-reads a file when its modification
+        time or size changes; call this to force the next load to parse it again,
+        e.g. after installing a module that provides a previously missing exception.
+        """
+        _CONFIG_CACHE.clear()
+        _resolve_exception_class.cache_clear()
+
+    def _read_config_settings(self, config_file: Path) -> Tuple[Dict[str, Any], Tuple[Tuple[str, str], ...]]:
+        """
+        Parses and validates a configuration file into the settings it provides.
+
+        Only keys actually present (and valid) in the file are included, apart
+        from ``EXCEPTION_CONFIG`` which is always set. Problems with individual
+        entries are returned as ``(logger method, message)`` pairs instead of
+        being logged, so the caller can log them on every load of the file.
+        """
+        raw_config = self._load_config_file(config_file)
+        self._validate_config_dict(raw_config, config_file)
 
-        self.DEBUG_MODE = raw_config.get("debug_mode", self.DEBUG_MODE) # Keep original case for this one, common practice
+        settings: Dict[str, Any] = {}
+        if "debug_mode" in raw_config: # Keep original case for this one, common practice
+            settings["debug_mode"] = raw_config["debug_mode"]
 
         # Load log formats from config file (case-insensitively for LOG_FORMAT, AUX_LOG_FORMAT)
         # and ensure they are strings before assigning.
-        log_format_from_file = upper_raw_config.get("LOG_FORMAT", self.LOG_FORMAT)
-        if isinstance(log_format_from_file, str):
-            self.LOG_FORMAT = log_format_from_file
-
-        aux_log_format_from_file = upper_raw_config.get("AUX_LOG_FORMAT", self.AUX_LOG_FORMAT)
-        if isinstance(aux_log_format_from_file, str):
-            self.AUX_LOG_FORMAT = aux_log_format_from_file
+        upper_raw_config = {k.upper(): v for k, v in raw_config.items()}
+        for format_key in ("LOG_FORMAT", "AUX_LOG_FORMAT"):
+            if isinstance(upper_raw_config.get(format_key), str):
+                settings[format_key] = upper_raw_config[format_key]
 
-        self.EXCEPTION_CONFIG = self._parse_exception_config(raw_config) # Pass original raw_config
+        diagnostics: List[Tuple[str, str]] = []
+        settings["EXCEPTION_CONFIG"] = self._parse_exception_config(raw_config, diagnostics) # Pass original raw_config
+        return settings, tuple(diagnostics)
 
-    def _find_config_file(self, filename_prefix: str, supported_extensions: List[str]) -> Path:
+    def _find_config_file(self, filename_prefix: str, supported_extensions: List[str], search_dir: Optional[Union[str, Path]] = None) -> Path:
+        base_dir = Path(search_dir) if search_dir is not None else Path()
         for ext in supported_extensions:
-            config_file = Path(f"{filename_prefix}.{ext}")
+            config_file = base_dir / f"{filename_prefix}.{ext}"
             if config_file.exists():
                 return config_file
         raise FileNotFoundError(f"No matching configuration file found for {filename_prefix} with extensions {supported_extensions}")
 
     def _load_config_file(self, config_file: Path) -> Any:
         extension = config_file.suffix[1:]
+        # YAML and TOML parsers are imported on first use so that loading DynEL
+        # (or a JSON config) does not pay for them.
+        parse_errors: Tuple[Type[BaseException], ...] = (json.JSONDecodeError,)
         try:
-            with config_file.open(mode="r") as f:
-                if extension == 'json':
-                    return json.load(f)
-                elif extension in ['yaml', 'yml']:
-                    return yaml.safe_load(f)
-                elif extension == 'toml':
-                    return toml.load(f)
-                else:
-                    logger.error(f"Unsupported configuration file format encountered: {extension}")
-                    raise ValueError(f"Unsupported configuration file format: {extension}")
-        except (json.JSONDecodeError, yaml.YAMLError, toml.TomlDecodeError) as e:
+            # Configs are small: read once and let the parsers scan one in-memory buffer.
+            buf = config_file.read_bytes()
+            if extension == 'json':
+                return _json_loads(buf)
+            elif extension in ['yaml', 'yml']:
+                import yaml
+                parse_errors = (yaml.YAMLError,)
+                # Prefer the libyaml C loader; PyYAML builds without it fall back to pure Python.
+                return yaml.load(buf, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+            elif extension == 'toml':
+                import tomllib
+                parse_errors = (tomllib.TOMLDecodeError,)
+                return tomllib.loads(buf.decode("utf-8"))
+            else:
+                logger.error(f"Unsupported configuration file format encountered: {extension}")
+                raise ValueError(f"Unsupported configuration file format: {extension}")
+        except parse_errors as e:
             logger.error(f"Error parsing DynEL configuration file '{config_file}': {e}")
             raise ValueError(f"Failed to parse DynEL configuration file '{config_file}': {e}") from e
         except Exception as e:
@@ -172,40 +344,41 @@ class DynelConfig:
             logger.error(f"Invalid DynEL configuration file '{config_file}': Expected a dictionary (object/map) at the root, got {type(raw_config).__name__}.")
             raise ValueError(f"Invalid DynEL configuration file '{config_file}': Root of configuration must be a dictionary.")
 
-    def _parse_exception_config(self, raw_config: dict) -> dict:
-        parsed_exception_config: dict[str, dict[str, Any]] = {}
+    def _parse_exception_config(self, raw_config: dict, diagnostics: List[Tuple[str, str]]) -> dict:
+        parsed_exception_config: dict[str, Mapping[str, Any]] = {}
         for key, value in raw_config.items():
             if key == "debug_mode":
                 continue
             if not isinstance(value, dict):
-                logger.warning(f"Configuration for '{key}' is not a dictionary. Skipping.")
+                diagnostics.append(("warning", f"Configuration for '{key}' is not a dictionary. Skipping."))
                 continue
-            exception_classes = self._load_exception_classes(key, value.get('exceptions', []))
+            exception_classes = self._load_exception_classes(key, value.get('exceptions', []), diagnostics)
             # Parse behaviors
             behaviors_config = value.get('behaviors', {})
-            parsed_behaviors = self._parse_behaviors(key, behaviors_config)
+            parsed_behaviors = self._parse_behaviors(key, behaviors_config, diagnostics)
 
-            parsed_exception_config[key] = {
-                'exceptions': exception_classes,
+            # Exceptions are stored as a tuple so handle_exception can pass them straight to isinstance()
+            parsed_exception_config[key] = MappingProxyType({
+                'exceptions': tuple(exception_classes),
                 'custom_message': str(value.get('custom_message', '')),
-                'tags': [str(tag) for tag in value.get('tags', []) if isinstance(tag, (str, int, float))],
+                'tags': tuple(str(tag) for tag in value.get('tags', []) if isinstance(tag, (str, int, float))),
                 'behaviors': parsed_behaviors
-            }
+            })
         return parsed_exception_config
 
-    def _parse_behaviors(self, func_key: str, behaviors_config: Any) -> Dict[str, Dict[str, Any]]:
+    def _parse_behaviors(self, func_key: str, behaviors_config: Any, diagnostics: List[Tuple[str, str]]) -> Mapping[str, Mapping[str, Any]]:
         """
         Parses the 'behaviors' sub-configuration for a given function.
         Validates the structure and specific behavior definitions.
         """
         if not isinstance(behaviors_config, dict):
-            logger.warning(f"Behaviors config for '{func_key}' is not a dictionary. Skipping behaviors.")
-            return {}
+            diagnostics.append(("warning", f"Behaviors config for '{func_key}' is not a dictionary. Skipping behaviors."))
+            return MappingProxyType({})
 
-        parsed_behaviors: Dict[str, Dict[str, Any]] = {}
+        parsed_behaviors: Dict[str, Mapping[str, Any]] = {}
         for behavior_key, behavior_def in behaviors_config.items():
             if not isinstance(behavior_def, dict):
-                logger.warning(f"Definition for behavior key '{behavior_key}' under function '{func_key}' is not a dictionary. Skipping this behavior entry.")
+                diagnostics.append(("warning", f"Definition for behavior key '{behavior_key}' under function '{func_key}' is not a dictionary. Skipping this behavior entry."))
                 continue
 
             current_behavior_actions: Dict[str, Any] = {}
@@ -213,9 +386,9 @@ class DynelConfig:
             if 'add_metadata' in behavior_def:
                 metadata = behavior_def['add_metadata']
                 if isinstance(metadata, dict):
-                    current_behavior_actions['add_metadata'] = metadata
+                    current_behavior_actions['add_metadata'] = MappingProxyType(metadata)
                 else:
-                    logger.warning(f"'add_metadata' for behavior '{behavior_key}' under function '{func_key}' is not a dictionary. Skipping 'add_metadata'.")
+                    diagnostics.append(("warning", f"'add_metadata' for behavior '{behavior_key}' under function '{func_key}' is not a dictionary. Skipping 'add_metadata'."))
 
             # Validate 'log_to_specific_file'
             if 'log_to_specific_file' in behavior_def:
@@ -223,39 +396,28 @@ class DynelConfig:
                 if isinstance(log_file, str) and log_file.strip():
                     current_behavior_actions['log_to_specific_file'] = log_file.strip()
                 else:
-                    logger.warning(f"'log_to_specific_file' for behavior '{behavior_key}' under function '{func_key}' is not a valid string. Skipping 'log_to_specific_file'.")
+                    diagnostics.append(("warning", f"'log_to_specific_file' for behavior '{behavior_key}' under function '{func_key}' is not a valid string. Skipping 'log_to_specific_file'."))
 
             # (Future: Add validation for 'custom_callback' or other behaviors here)
 
             if current_behavior_actions:
                 # behavior_key here can be an exception name string (e.g., "ValueError") or "default"
-                parsed_behaviors[behavior_key] = current_behavior_actions
+                parsed_behaviors[behavior_key] = MappingProxyType(current_behavior_actions)
             else:
-                logger.info(f"No valid actions found for behavior key '{behavior_key}' under function '{func_key}'.")
+                diagnostics.append(("info", f"No valid actions found for behavior key '{behavior_key}' under function '{func_key}'."))
 
-        return parsed_behaviors
+        return MappingProxyType(parsed_behaviors)
 
-    def _load_exception_classes(self, key: str, exceptions: list) -> list:
+    def _load_exception_classes(self, key: str, exceptions: list, diagnostics: List[Tuple[str, str]]) -> list:
         exception_classes: list[Type[BaseException]] = []
         for exception_str in exceptions:
             if not isinstance(exception_str, str):
-                logger.warning(f"Invalid exception name type for '{key}': {exception_str}. Must be a string. Skipping.")
+                diagnostics.append(("warning", f"Invalid exception name type for '{key}': {exception_str}. Must be a string. Skipping."))
                 continue
-            exception_class_val: Any = None
             try:
-                exception_class_val = getattr(__builtins__, exception_str, None)  # type: ignore
-                if not (exception_class_val and isinstance(exception_class_val, type) and issubclass(exception_class_val, BaseException)):
-                    if '.' in exception_str:
-                        module_name, class_name = exception_str.rsplit('.', 1)
-                        module = importlib.import_module(module_name)
-                        exception_class_val = getattr(module, class_name)
-                if not (isinstance(exception_class_val, type) and issubclass(exception_class_val, BaseException)):
-                    raise TypeError(f"'{exception_str}' is not a BaseException subclass.")
-            except (AttributeError, ImportError, ValueError, TypeError) as e:
-                logger.warning(f"Could not load or validate exception '{exception_str}' for '{key}': {e}. Skipping.")
-                continue
+                exception_classes.append(_resolve_exception(exception_str))
+            except _ResolveError as e:
+                diagnostics.append(("warning", f"Could not load or validate exception '{exception_str}' for '{key}': {e}. Skipping."))
             except Exception as e:
-                logger.error(f"Unexpected error loading exception '{exception_str}' for '{key}': {e}. Skipping.")
-                continue
-            exception_classes.append(exception_class_val)
+                diagnostics.append(("error", f"Unexpected error loading exception '{exception_str}' for '{key}': {e}. Skipping."))
         return exception_classes
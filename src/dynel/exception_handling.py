@@ -1,13 +1,105 @@
-import inspect
+import functools
 import os
+import reprlib
 import sys
+import threading
+import types
+from sys import _getframe
 from datetime import datetime, timezone
-from typing import Any, Union, cast
+from typing import Any, Mapping, Union, cast
 
 from loguru import logger
 
 from .config import DynelConfig, ContextLevel, CustomContext
 
+# Context levels that include the caller's local variables.
+_LOCAL_VARS_CONTEXT_LEVELS = frozenset({ContextLevel.MEDIUM, ContextLevel.DETAILED})
+
+# Bounded repr for local variables, so a large local (e.g. a big list or
+# array) cannot turn one exception into megabytes of log output.
+_LOCAL_REPR = reprlib.Repr()
+_LOCAL_REPR.maxlevel = 3
+_LOCAL_REPR.maxdict = _LOCAL_REPR.maxlist = _LOCAL_REPR.maxtuple = 20
+_LOCAL_REPR.maxset = _LOCAL_REPR.maxfrozenset = _LOCAL_REPR.maxdeque = _LOCAL_REPR.maxarray = 20
+_LOCAL_REPR.maxstring = _LOCAL_REPR.maxlong = _LOCAL_REPR.maxother = 200
+
+
+# Page size and CPU count do not change while the process runs, so the DETAILED
+# context reads them once. Available pages are still read per exception.
+@functools.lru_cache(maxsize=1)
+def _page_size() -> int:
+    return os.sysconf("SC_PAGE_SIZE")
+
+
+@functools.lru_cache(maxsize=1)
+def _cpu_count() -> Union[int, None]:
+    return os.cpu_count()
+
+
+def _accepts_mirror_target(target_file: str):
+    """Returns a Loguru filter passing only records bound with ``mirror_target=target_file``."""
+    def _filter(record: Any) -> bool:
+        return record["extra"].get("mirror_target") == target_file
+    return _filter
+
+
+# Loguru handler ids and log formats of the persistent ``log_to_specific_file``
+# handlers, keyed by target file. Adding a Loguru file handler (and its enqueue
+# worker) per exception cost milliseconds; a cached handler lets Loguru's
+# background writer batch the mirrored records instead.
+_MIRROR_HANDLERS: dict[str, tuple[int, str]] = {}
+_MIRROR_LOCK = threading.Lock()
+
+
+def _ensure_mirror_handler(target_file: str, log_format: str) -> None:
+    """
+    Makes sure one handler writes records mirrored to ``target_file``.
+
+    A cached handler that uses another format is replaced. Handlers removed
+    outside DynEL (e.g. by a bare ``logger.remove()``) cannot be detected, so
+    call :func:`close_mirror_handlers` after removing them that way.
+    """
+    with _MIRROR_LOCK:
+        cached = _MIRROR_HANDLERS.get(target_file)
+        if cached is not None:
+            handler_id, cached_format = cached
+            if cached_format == log_format:
+                return
+            try:
+                logger.remove(handler_id)
+            except ValueError:
+                pass # Already removed, e.g. by logger.remove()
+        handler_id = logger.add(
+            target_file,
+            level="ERROR",
+            format=log_format,
+            filter=_accepts_mirror_target(target_file),
+            rotation="5 MB", # Smaller rotation for specific error logs
+            catch=True, # Catch errors within this specific logger too
+            serialize=True, # Keep it structured
+            enqueue=True
+        )
+        _MIRROR_HANDLERS[target_file] = (handler_id, log_format)
+
+
+def close_mirror_handlers() -> None:
+    """
+    Removes the handlers DynEL added for ``log_to_specific_file`` behaviors.
+
+    Pending records are written and the files closed. Handlers are added again
+    the next time an exception is mirrored to their file. :func:`configure_logging`
+    calls this too; call it yourself after removing Loguru handlers directly
+    (e.g. with a bare ``logger.remove()``).
+    """
+    with _MIRROR_LOCK:
+        handler_ids = [handler_id for handler_id, _ in _MIRROR_HANDLERS.values()]
+        _MIRROR_HANDLERS.clear()
+        for handler_id in handler_ids:
+            try:
+                logger.remove(handler_id)
+            except ValueError:
+                pass # Already removed, e.g. by logger.remove()
+
 
 def handle_exception(config: DynelConfig, error: Exception) -> None:
     """
@@ -22,28 +114,31 @@ def handle_exception(config: DynelConfig, error: Exception) -> None:
     after logging the exception.
 
     The function name, where the exception is considered to have occurred for
-    configuration lookup, is determined by inspecting the call stack (specifically,
-    the caller of this ``handle_exception`` function).
+    configuration lookup, is taken from the caller's frame (specifically, the
+    caller of this ``handle_exception`` function).
 
     :param config: The DynelConfig instance containing all operational settings.
     :type config: DynelConfig
     :param error: The exception instance that was caught and needs to be handled.
     :type error: Exception
     """
-    func_name = inspect.stack()[1][3]
+    # Only the caller's frame is needed; inspect.stack() would build FrameInfo
+    # (and read source lines) for every frame on the stack.
+    caller_frame = _getframe(1)
+    func_name = caller_frame.f_code.co_name
     # Use function_config for all function-specific settings
     function_config = config.EXCEPTION_CONFIG.get(func_name)
     context_level = config.CUSTOM_CONTEXT_LEVEL
 
     custom_context_dict: dict[str, Any] = {"timestamp": str(datetime.now(timezone.utc).isoformat())}
 
-    if context_level in [ContextLevel.MEDIUM, ContextLevel.DETAILED]:
-        caller_frame_info = inspect.stack()[1]
-        caller_frame = caller_frame_info[0]
-        local_vars = caller_frame.f_locals if caller_frame else None
+    if context_level in _LOCAL_VARS_CONTEXT_LEVELS:
+        local_vars = caller_frame.f_locals
         if local_vars:
             try:
-                custom_context_dict["local_vars"] = str(local_vars)
+                # Keep a structured mapping of variable name -> bounded repr so sinks
+                # can index individual variables instead of parsing one large string.
+                custom_context_dict["local_vars"] = {name: _LOCAL_REPR.repr(value) for name, value in local_vars.items()}
             except Exception:
                 custom_context_dict["local_vars"] = "Error converting local_vars to string"
         else:
@@ -52,44 +147,55 @@ def handle_exception(config: DynelConfig, error: Exception) -> None:
     if context_level == ContextLevel.DETAILED:
         detailed_context: dict[str, Any] = {}
         try:
-            detailed_context["free_memory"] = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_AVPHYS_PAGES")
-            detailed_context["cpu_count"] = os.cpu_count()
+            detailed_context["free_memory"] = _page_size() * os.sysconf("SC_AVPHYS_PAGES")
+            detailed_context["cpu_count"] = _cpu_count()
         except (OSError, AttributeError):
             detailed_context["system_info_error"] = "Could not retrieve some system info (memory/CPU)"
         try:
-            detailed_context["env_details"] = dict(os.environ)
+            detailed_context["env_details"] = config.env_snapshot()
         except Exception:
             detailed_context["env_details_error"] = "Could not retrieve environment variables"
         custom_context_dict |= detailed_context
 
-    log_message = f"Exception caught in {func_name}"
     final_custom_message = None
     final_tags = None
     specific_behaviors = None
     default_behaviors = {} # Initialize to empty dict
 
     if function_config:
+        function_behaviors = function_config.get('behaviors', {})
         # Default behaviors for the function, if any
-        default_behaviors = function_config.get('behaviors', {}).get('default', {})
-
-        for configured_exc_type in function_config.get('exceptions', []):
-            if isinstance(error, configured_exc_type):
-                final_custom_message = function_config.get('custom_message')
-                final_tags = function_config.get('tags')
-
-                # Check for behaviors specific to this exception type
-                exception_type_name = type(error).__name__ # More robust: error.__class__.__name__
-                # Also consider fully qualified name if needed for config: f"{error.__class__.__module__}.{error.__class__.__name__}"
-                # For now, simple name, assuming config uses simple names for specific overrides
-                specific_behaviors = function_config.get('behaviors', {}).get(exception_type_name, {})
-
-                if final_custom_message:
-                    log_message += f" - Custom Message: {final_custom_message}"
-                break # Found the matching configured exception type
-
-    # Apply default behaviors first, then override with specific behaviors
-    # Ensure specific_behaviors is a dict if None
-    applied_behaviors: dict[str, Any] = {**default_behaviors, **(specific_behaviors if specific_behaviors is not None else {})}
+        default_behaviors = function_behaviors.get('default', {})
+
+        # Loaded configs already store a tuple; only hand-built entries (e.g. lists) are converted
+        handled_exceptions = function_config.get('exceptions', ())
+        if not isinstance(handled_exceptions, tuple):
+            handled_exceptions = tuple(handled_exceptions)
+        # A single isinstance() against the tuple replaces a per-type loop
+        if isinstance(error, handled_exceptions):
+            final_custom_message = function_config.get('custom_message')
+            final_tags = function_config.get('tags')
+
+            # Check for behaviors specific to this exception type
+            exception_type_name = type(error).__name__ # More robust: error.__class__.__name__
+            # Also consider fully qualified name if needed for config: f"{error.__class__.__module__}.{error.__class__.__name__}"
+            # For now, simple name, assuming config uses simple names for specific overrides
+            specific_behaviors = function_behaviors.get(exception_type_name, {})
+
+    if final_custom_message:
+        log_message = "".join(("Exception caught in ", func_name, " - Custom Message: ", final_custom_message))
+    else:
+        log_message = "Exception caught in " + func_name
+
+    # Apply default behaviors first, then override with specific behaviors.
+    # Usually at most one side is set; use it as-is instead of building a merged dict.
+    applied_behaviors: Mapping[str, Any]
+    if not specific_behaviors:
+        applied_behaviors = default_behaviors
+    elif not default_behaviors:
+        applied_behaviors = specific_behaviors
+    else:
+        applied_behaviors = {**default_behaviors, **specific_behaviors}
 
     if final_tags:
         custom_context_dict["tags"] = final_tags
@@ -98,7 +204,7 @@ def handle_exception(config: DynelConfig, error: Exception) -> None:
     if 'add_metadata' in applied_behaviors:
         # Ensure metadata is a dict, though validation should happen in config parsing
         metadata_to_add = applied_behaviors['add_metadata']
-        if isinstance(metadata_to_add, dict):
+        if isinstance(metadata_to_add, Mapping):
             custom_context_dict.update(metadata_to_add) # Changed from |= for Python <3.9 compatibility
         else:
             logger.warning(f"Invalid 'add_metadata' format for {func_name}. Expected dict, got {type(metadata_to_add)}. Skipping.")
@@ -110,13 +216,9 @@ def handle_exception(config: DynelConfig, error: Exception) -> None:
     bound_logger.exception(log_message, exception=error)
 
     # Implement 'log_to_specific_file' behavior
-    # TODO: Performance: Adding/removing handlers on each exception can be costly,
-    # especially in concurrent scenarios (can also lead to log loss if remove races).
-    # Consider caching handlers or using a more persistent handler approach per file if this becomes a bottleneck.
     if 'log_to_specific_file' in applied_behaviors:
         target_file = applied_behaviors['log_to_specific_file']
         if isinstance(target_file, str):
-            handler_id = None
             try:
                 # Use configured AUX_LOG_FORMAT, fallback to LOG_FORMAT, then to a hardcoded default from DynelConfig
                 log_format = config.AUX_LOG_FORMAT # Relies on DynelConfig providing a default via constructor or file load
@@ -128,17 +230,10 @@ def handle_exception(config: DynelConfig, error: Exception) -> None:
                      log_format = log_format.replace("<cyan>", "").replace("</cyan>", "")
                      # Add other color tags here if used in custom formats (e.g., from config.LOG_FORMAT)
 
-                handler_id = logger.add(
-                    target_file,
-                    level="ERROR", # Or config.DEBUG_MODE related level (e.g. "DEBUG" if config.DEBUG_MODE else "ERROR")
-                    format=log_format,
-                    rotation="5 MB", # Smaller rotation for specific error logs
-                    catch=True, # Catch errors within this specific logger too
-                    serialize=True, # Keep it structured
-                    enqueue=True
-                )
-                # Log again, this time it will go to the specific file as well as existing handlers.
-                logger.bind(**cast(CustomContext, custom_context_dict)).exception(
+                # Log again; the record is bound to the target file so only its mirror
+                # handler (alongside the existing handlers) picks it up.
+                _ensure_mirror_handler(target_file, log_format)
+                bound_logger.bind(mirror_target=target_file).exception(
                     f"[Mirrored to {target_file}] {log_message}",
                     exception=error
                 )
@@ -146,9 +241,6 @@ def handle_exception(config: DynelConfig, error: Exception) -> None:
                     logger.debug(f"Logged details for error in {func_name} to {target_file}") # Changed to debug level
             except Exception as e_handler:
                 logger.error(f"Failed to log to specific file {target_file} for {func_name}: {e_handler}")
-            finally:
-                if handler_id is not None:
-                    logger.remove(handler_id)
         else:
             logger.warning(f"Invalid 'log_to_specific_file' path for {func_name}. Expected string, got {type(target_file)}. Skipping.")
 
@@ -162,13 +254,15 @@ def module_exception_handler(config: DynelConfig, module: Any) -> None:
     """
     Attaches DynEL's exception handling to all functions within a given module.
 
-    It iterates over all members of the `module` (functions and classes) and
+    It iterates over the functions and classes in the `module` and
     wraps any functions or methods found with Loguru's ``@logger.catch``,
     using a custom ``onerror`` handler. This custom handler ensures that
     :func:`handle_exception` is invoked for exceptions.
 
     Original functions and methods in the module/classes are replaced by their
-    wrapped versions (in-place modification).
+    wrapped versions (in-place modification). Imported functions are wrapped
+    only in this module's namespace, but classes imported from other modules
+    are skipped, since patching their methods would affect every importer.
 
     .. warning::
         This function modifies the provided module and its classes by replacing
@@ -181,7 +275,7 @@ def module_exception_handler(config: DynelConfig, module: Any) -> None:
           method's name (e.g., `my_method`). If different configurations are needed for
           methods with the same name in different classes, the config keys would need
           to be more specific (e.g., `MyClass.my_method`), which is not currently
-          supported by `handle_exception`'s `inspect.stack()[1][3]` logic without changes.
+          supported by `handle_exception`'s caller-frame lookup without changes.
 
     :param config: The DynelConfig instance to use for the exception handlers.
     :type config: DynelConfig
@@ -203,55 +297,41 @@ def module_exception_handler(config: DynelConfig, module: Any) -> None:
     # Get the actual onerror handler instance for this module_exception_handler call
     actual_onerror_handler = _onerror_handler_factory(config)
 
-    for name, obj in inspect.getmembers(module):
-        if inspect.isfunction(obj): # Handles regular functions and staticmethods if not yet bound
+    module_name = getattr(module, '__name__', None)
+    # Scan the module's own namespace (no dir() sort or descriptor lookups); snapshot it
+    # since wrapping rebinds names.
+    for name, obj in list(vars(module).items()):
+        if isinstance(obj, types.FunctionType):
             wrapped_member = logger.catch(onerror=actual_onerror_handler, reraise=True)(obj)
             setattr(module, name, wrapped_member)
             if config.DEBUG_MODE:
                 logger.debug("Wrapped function/staticmethod: %s in module %s", name, module_name_for_log)
 
-        elif inspect.isclass(obj):
-            # Iterate through members of the class
-            for class_attr_name, class_attr_value in inspect.getmembers(obj):
-                # Check for functions (potential instance methods, class methods, static methods)
-                # inspect.isfunction: for regular methods, staticmethods (if not yet bound by decorator)
-                # inspect.ismethod: for classmethods (already bound by @classmethod)
-                # We need to be careful not to double-wrap or misinterpret.
-                # logger.catch should work on callables.
-
-                if callable(class_attr_value):
-                    # Distinguish between staticmethod, classmethod, and regular instance method
-                    # For staticmethod and classmethod, they might appear as functions if accessed via __dict__
-                    # or as methods if accessed via getattr(obj, class_attr_name) after class creation.
-                    # We are iterating via inspect.getmembers(obj) where obj is the class itself.
-
-                    original_member = class_attr_value
-
-                    # If it's a staticmethod or classmethod, it's already a descriptor.
-                    # We need to wrap the underlying function if possible.
-                    if isinstance(original_member, (staticmethod, classmethod)):
-                        # The actual function is in __func__
-                        actual_func = original_member.__func__
-                        wrapped_func = logger.catch(onerror=actual_onerror_handler, reraise=True)(actual_func)
-                        # Re-apply the original decorator type
-                        if isinstance(original_member, staticmethod):
-                            wrapped_member = staticmethod(wrapped_func)
-                        else: # classmethod
-                            wrapped_member = classmethod(wrapped_func)
-                    elif inspect.isfunction(original_member): # Regular function defined in class (becomes instance method)
-                        wrapped_member = logger.catch(onerror=actual_onerror_handler, reraise=True)(original_member)
-                    else:
-                        # Not a function, staticmethod, or classmethod we can easily wrap (e.g. already bound method, other callable object)
-                        # Could also be a C-implemented method, which inspect.isfunction might miss.
-                        # For PoC, we'll skip these more complex cases.
-                        if config.DEBUG_MODE:
-                            logger.debug("Skipping non-standard callable: %s.%s of type %s", obj.__name__, class_attr_name, type(original_member).__name__)
-                        continue
-
-                    try:
-                        setattr(obj, class_attr_name, wrapped_member)
-                        if config.DEBUG_MODE:
-                            logger.debug("Wrapped method: %s.%s in module %s", obj.__name__, class_attr_name, module_name_for_log)
-                    except Exception as e: # Catch potential errors like trying to set on built-in types
-                        if config.DEBUG_MODE:
-                            logger.error("Failed to wrap method %s.%s: %s", obj.__name__, class_attr_name, e)
+        elif isinstance(obj, type):
+            # Wrapping methods patches the class itself, so leave classes owned by other modules alone
+            if obj.__module__ != module_name:
+                continue
+            # Walk the class's own namespace: raw staticmethod/classmethod descriptors
+            # stay visible, and inherited members (e.g. object's dunders) are not visited.
+            for class_attr_name, original_member in list(vars(obj).items()):
+                # If it's a staticmethod or classmethod, wrap the underlying function
+                # and re-apply the original decorator type
+                if isinstance(original_member, (staticmethod, classmethod)):
+                    wrapped_func = logger.catch(onerror=actual_onerror_handler, reraise=True)(original_member.__func__)
+                    wrapped_member = type(original_member)(wrapped_func)
+                elif isinstance(original_member, types.FunctionType): # Regular function defined in class (becomes instance method)
+                    wrapped_member = logger.catch(onerror=actual_onerror_handler, reraise=True)(original_member)
+                else:
+                    # Not a function, staticmethod, or classmethod we can easily wrap (e.g. a nested class or
+                    # other callable object). For PoC, we'll skip these more complex cases.
+                    if config.DEBUG_MODE and callable(original_member):
+                        logger.debug("Skipping non-standard callable: %s.%s of type %s", obj.__name__, class_attr_name, type(original_member).__name__)
+                    continue
+
+                try:
+                    setattr(obj, class_attr_name, wrapped_member)
+                    if config.DEBUG_MODE:
+                        logger.debug("Wrapped method: %s.%s in module %s", obj.__name__, class_attr_name, module_name_for_log)
+                except Exception as e: # Catch potential errors like trying to set on built-in types
+                    if config.DEBUG_MODE:
+                        logger.error("Failed to wrap method %s.%s: %s", obj.__name__, class_attr_name, e)
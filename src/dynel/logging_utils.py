@@ -1,14 +1,25 @@
 from loguru import logger
 from .config import DynelConfig
+from .exception_handling import close_mirror_handlers
 from typing import List
 
 _tracked_handler_ids: List[int] = []
 
+_LOG_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
+    "<level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
+    "<level>{message}</level> | {extra}"
+)
+# Same layout as _LOG_FORMAT without color tags, used when formatting is disabled.
+_PLAIN_LOG_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message} | {extra}"
+
 def configure_logging(config: DynelConfig, log_file: str = "dynel.log", json_file: str = "dynel.json") -> None:
     """
     Configures Loguru's logging settings based on the provided DynelConfig.
 
-    Removes previously tracked Loguru handlers and sets up new ones:
+    Removes previously tracked Loguru handlers (including the ``log_to_specific_file``
+    mirror handlers, which are added again on demand) and sets up new ones:
     - Rotating file sink for text logs (dynel.log).
     - Rotating file sink for JSON logs (dynel.json).
 
@@ -25,20 +36,14 @@ def configure_logging(config: DynelConfig, log_file: str = "dynel.log", json_fil
             # Handler was already removed or doesn't exist
             pass
     _tracked_handler_ids.clear()
-    log_format = (
-        "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
-        "<level>{level: <8}</level> | "
-        "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
-        "<level>{message}</level> | {extra}"
-    )
-    if not config.FORMATTING_ENABLED:
-        # Remove color tags if formatting is disabled
-        log_format = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message} | {extra}"
+    close_mirror_handlers()
+    log_format = _LOG_FORMAT if config.FORMATTING_ENABLED else _PLAIN_LOG_FORMAT
+    level = "DEBUG" if config.DEBUG_MODE else "INFO"
 
     # Add and track new handlers
     handler_id = logger.add(
         sink=log_file,
-        level="DEBUG" if config.DEBUG_MODE else "INFO",
+        level=level,
         format=log_format,
         rotation="10 MB",
         catch=True,
@@ -49,7 +54,7 @@ def configure_logging(config: DynelConfig, log_file: str = "dynel.log", json_fil
     handler_id = logger.add(
         sink=json_file,
         serialize=True,
-        level="DEBUG" if config.DEBUG_MODE else "INFO",
+        level=level,
         rotation="10 MB",
         catch=True,
         enqueue=True
@@ -0,0 +1,41 @@
+import os
+import types
+
+import pytest
+
+from src.dynel.config import DynelConfig
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _run_in_scratch_cwd(tmp_path_factory):
+    """
+    Runs the session from a scratch directory, so files DynEL creates relative
+    to the working directory (e.g. dynel.log) never land in the checkout.
+    Tests that read files pass absolute paths instead of changing directory.
+    """
+    original_cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("cwd"))
+    yield
+    os.chdir(original_cwd)
+
+
+@pytest.fixture
+def dynel_config_instance():
+    """Returns a default DynelConfig instance."""
+    return DynelConfig()
+
+
+@pytest.fixture
+def fake_stack(monkeypatch):
+    """
+    Returns a helper that makes exception_handling see ``func_name`` as the
+    caller of ``handle_exception``, with optional ``f_locals``.
+    """
+    def _install(func_name, f_locals=None):
+        caller_frame = types.SimpleNamespace(
+            f_code=types.SimpleNamespace(co_name=func_name),
+            f_locals=f_locals if f_locals is not None else {},
+        )
+        monkeypatch.setattr("src.dynel.exception_handling._getframe", lambda depth=0: caller_frame)
+        return caller_frame
+    return _install
@@ -1,12 +1,12 @@
 import pytest
 import json
-import yaml
-import toml
+import re
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import call, patch, MagicMock
 
 # Importing from the new locations in src.dynel
-from src.dynel.config import DynelConfig, ContextLevel # Corrected import path
+from src.dynel import config as dynel_config_module
+from src.dynel.config import DynelConfig, ContextLevel, _resolve_exception_class # Corrected import path
 
 # --- Test Data ---
 VALID_CONFIG_DATA_DICT = {
@@ -23,37 +23,50 @@ VALID_CONFIG_DATA_DICT = {
     },
 }
 
+try:
+    from orjson import dumps as _json_dumps # Writes bytes directly
+except ImportError:
+    def _json_dumps(data) -> bytes:
+        return json.dumps(data).encode()
+
+# Built once and shared by every test that runs against each file format
+EXT_PARAMS = pytest.mark.parametrize("ext", ["json", "yaml", "toml"], ids=["json", "yaml", "toml"])
+
 # --- Fixtures ---
 
-@pytest.fixture
-def temp_config_file_generator():
+def _serialize_config(extension: str, data: dict) -> bytes:
+    """Serializes config data to the on-disk bytes for the given extension."""
+    if extension == "json":
+        return _json_dumps(data)
+    if extension in ("yaml", "yml"):
+        import yaml
+        # libyaml-backed emitter when PyYAML was built with it
+        return yaml.dump(data, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper)).encode()
+    if extension == "toml":
+        import tomli_w
+        return tomli_w.dumps(data).encode()
+    raise ValueError(f"Unsupported extension for temp config: {extension}")
+
+
+@pytest.fixture(scope="session")
+def temp_config_file_generator(tmp_path_factory):
     """
-    Factory fixture to generate temporary config files (json, yaml, toml).
-    The actual tmp_path should be passed by the test function.
+    Factory fixture to generate config files (json, yaml, toml).
+    Each file gets its own directory to pass as ``search_dir``.
     """
-    def _create_temp_file(
-        base_path: Path, filename_prefix: str, extension: str, data: dict
-    ):
-        file_path = base_path / f"{filename_prefix}.{extension}"
-        if extension == "json":
-            with open(file_path, "w") as f:
-                json.dump(data, f)
-        elif extension in ["yaml", "yml"]:
-            with open(file_path, "w") as f:
-                yaml.dump(data, f)
-        elif extension == "toml":
-            with open(file_path, "w") as f:
-                toml.dump(data, f)
-        else:
-            raise ValueError(f"Unsupported extension for temp config: {extension}")
+    def _create_temp_file(filename_prefix: str, extension: str, data: dict) -> Path:
+        file_path = tmp_path_factory.mktemp("cfg") / f"{filename_prefix}.{extension}"
+        file_path.write_bytes(_serialize_config(extension, data))
         return file_path
     return _create_temp_file
 
 
-@pytest.fixture
-def dynel_config_instance():
-    """Returns a default DynelConfig instance."""
-    return DynelConfig()
+@pytest.fixture(autouse=True)
+def _clear_exception_resolver_cache():
+    """Keeps memoized exception-name lookups and parsed files from leaking between tests."""
+    DynelConfig.clear_load_cache()
+    yield
+    DynelConfig.clear_load_cache()
 
 
 # --- Tests for DynelConfig ---
@@ -66,24 +79,62 @@ def test_dynel_config_defaults(dynel_config_instance):
     assert dynel_config_instance.EXCEPTION_CONFIG == {}
 
 
-@pytest.mark.parametrize("ext", ["json", "yaml", "toml"])
+def test_dynel_config_reset():
+    config = DynelConfig(context_level="det", debug=True, formatting=False, panic_mode=True, log_format="{message}")
+    config.EXCEPTION_CONFIG = {"func": {"exceptions": [ValueError]}}
+
+    config.reset()
+
+    assert config.CUSTOM_CONTEXT_LEVEL == ContextLevel.MINIMAL
+    assert config.DEBUG_MODE is False
+    assert config.FORMATTING_ENABLED is True
+    assert config.PANIC_MODE is False
+    assert config.LOG_FORMAT == DynelConfig.DEFAULT_LOG_FORMAT
+    assert config.AUX_LOG_FORMAT == DynelConfig.DEFAULT_AUX_LOG_FORMAT
+    assert config.EXCEPTION_CONFIG == {}
+
+
+def test_env_snapshot_is_cached_until_refreshed(monkeypatch):
+    config = DynelConfig()
+    monkeypatch.setenv("DYNEL_TEST_VAR", "first")
+    snapshot = config.env_snapshot()
+    assert snapshot["DYNEL_TEST_VAR"] == "first"
+
+    snapshot["DYNEL_TEST_VAR"] = "changed by a sink"  # Callers get a copy, not the cached snapshot
+    monkeypatch.setenv("DYNEL_TEST_VAR", "second")
+    assert config.env_snapshot()["DYNEL_TEST_VAR"] == "first"
+
+    config.refresh_env_snapshot()
+    assert config.env_snapshot()["DYNEL_TEST_VAR"] == "second"
+
+
+def test_dynel_config_rejects_unknown_attributes():
+    config = DynelConfig()
+    with pytest.raises(AttributeError):
+        config.debug_mode = True  # Typo for DEBUG_MODE is caught instead of silently ignored
+
+
+@EXT_PARAMS
 def test_load_exception_config_valid(
-    temp_config_file_generator, dynel_config_instance, ext, tmp_path, monkeypatch
+    temp_config_file_generator, dynel_config_instance, ext
 ):
-    config_data = VALID_CONFIG_DATA_DICT.copy()
+    config_data = VALID_CONFIG_DATA_DICT
     filename_prefix = "test_dynel_config"
-    temp_config_file_generator(tmp_path, filename_prefix, ext, config_data)
+    config_path = temp_config_file_generator(filename_prefix, ext, config_data)
 
-    monkeypatch.chdir(tmp_path)
     # Assuming load_exception_config uses loguru.logger internally
-    with patch('src.dynel.config.logger') as mock_logger: # Patch logger in src.dynel.config
-        dynel_config_instance.load_exception_config(filename_prefix=filename_prefix)
+    with patch.object(dynel_config_module, "logger") as mock_logger: # Patch logger in src.dynel.config
+        dynel_config_instance.load_exception_config(filename_prefix=filename_prefix, search_dir=config_path.parent)
 
     assert dynel_config_instance.DEBUG_MODE == config_data["debug_mode"]
     assert "MyFunction" in dynel_config_instance.EXCEPTION_CONFIG
     mf_config = dynel_config_instance.EXCEPTION_CONFIG["MyFunction"]
     assert mf_config["custom_message"] == config_data["MyFunction"]["custom_message"]
-    assert set(mf_config["tags"]) == set(config_data["MyFunction"]["tags"])
+    assert mf_config["tags"] == tuple(config_data["MyFunction"]["tags"])
+    # Loaded entries are read-only and hold tuples
+    assert type(mf_config["tags"]) is tuple and type(mf_config["exceptions"]) is tuple
+    with pytest.raises(TypeError):
+        mf_config["custom_message"] = "changed"
     assert ValueError in mf_config["exceptions"]
     assert TypeError in mf_config["exceptions"]
     # Basic check behaviors are absent if not in config
@@ -125,19 +176,17 @@ VALID_CONFIG_WITH_BEHAVIORS = {
     }
 }
 
-@pytest.mark.parametrize("ext", ["json", "yaml", "toml"])
+@EXT_PARAMS
 def test_load_exception_config_with_valid_behaviors(
-    temp_config_file_generator, dynel_config_instance, ext, tmp_path, monkeypatch
+    temp_config_file_generator, dynel_config_instance, ext
 ):
-    config_data = VALID_CONFIG_WITH_BEHAVIORS.copy()
-    # Remove the invalid part for this valid test
-    del config_data["TestFuncInvalidBehaviors"]
+    # Leave out the invalid part for this valid test
+    config_data = {k: v for k, v in VALID_CONFIG_WITH_BEHAVIORS.items() if k != "TestFuncInvalidBehaviors"}
     filename_prefix = "test_config_valid_behaviors"
-    temp_config_file_generator(tmp_path, filename_prefix, ext, config_data)
+    config_path = temp_config_file_generator(filename_prefix, ext, config_data)
 
-    monkeypatch.chdir(tmp_path)
-    with patch('src.dynel.config.logger') as mock_logger:
-        dynel_config_instance.load_exception_config(filename_prefix=filename_prefix)
+    with patch.object(dynel_config_module, "logger") as mock_logger:
+        dynel_config_instance.load_exception_config(filename_prefix=filename_prefix, search_dir=config_path.parent)
 
     assert "TestFuncWithBehaviors" in dynel_config_instance.EXCEPTION_CONFIG
     func_config = dynel_config_instance.EXCEPTION_CONFIG["TestFuncWithBehaviors"]
@@ -156,30 +205,27 @@ def test_load_exception_config_with_valid_behaviors(
     mock_logger.warning.assert_not_called() # No warnings for valid behaviors
 
 
-@pytest.mark.parametrize("ext", ["json", "yaml", "toml"])
+@EXT_PARAMS
 def test_load_exception_config_with_invalid_behaviors(
-    temp_config_file_generator, dynel_config_instance, ext, tmp_path, monkeypatch
+    temp_config_file_generator, dynel_config_instance, ext
 ):
-    config_data = VALID_CONFIG_WITH_BEHAVIORS.copy()
     # Keep only the invalid part for this test
-    config_data = {"TestFuncInvalidBehaviors": config_data["TestFuncInvalidBehaviors"]}
+    config_data = {"TestFuncInvalidBehaviors": VALID_CONFIG_WITH_BEHAVIORS["TestFuncInvalidBehaviors"]}
 
     filename_prefix = "test_config_invalid_behaviors"
-    temp_config_file_generator(tmp_path, filename_prefix, ext, config_data)
+    config_path = temp_config_file_generator(filename_prefix, ext, config_data)
 
-    monkeypatch.chdir(tmp_path)
     # We need to mock logger.warning as it's called by _parse_behaviors
-    with patch('src.dynel.config.logger.warning') as mock_logger_warning:
-        dynel_config_instance.load_exception_config(filename_prefix=filename_prefix)
+    with patch.object(dynel_config_module.logger, "warning") as mock_logger_warning:
+        dynel_config_instance.load_exception_config(filename_prefix=filename_prefix, search_dir=config_path.parent)
 
     assert "TestFuncInvalidBehaviors" in dynel_config_instance.EXCEPTION_CONFIG
     func_config = dynel_config_instance.EXCEPTION_CONFIG["TestFuncInvalidBehaviors"]
     assert "behaviors" in func_config
     behaviors = func_config["behaviors"]
 
-    # The "AttributeError" behavior key should exist, but its actions should be empty due to validation failures
-    assert "AttributeError" in behaviors
-    assert not behaviors["AttributeError"] # No valid actions parsed
+    # Both "AttributeError" actions fail validation, and a behavior key with no valid actions is dropped
+    assert "AttributeError" not in behaviors
 
     # The "default" behavior key itself was invalid (not a dict)
     assert "default" not in behaviors # Or it might be present but empty, depending on parsing logic for top-level behavior keys
@@ -187,16 +233,13 @@ def test_load_exception_config_with_invalid_behaviors(
     # Check that warnings were logged
     assert mock_logger_warning.call_count >= 3 # one for add_metadata, one for log_to_specific_file, one for default behavior_def
 
-    # Example check for one of the expected warning messages
-    mock_logger_warning.assert_any_call(
-        "'add_metadata' for behavior 'AttributeError' under function 'TestFuncInvalidBehaviors' is not a dictionary. Skipping 'add_metadata'."
-    )
-    mock_logger_warning.assert_any_call(
-        "'log_to_specific_file' for behavior 'AttributeError' under function 'TestFuncInvalidBehaviors' is not a valid string. Skipping 'log_to_specific_file'."
-    )
-    mock_logger_warning.assert_any_call(
-        "Definition for behavior key 'default' under function 'TestFuncInvalidBehaviors' is not a dictionary. Skipping this behavior entry."
-    )
+    # All expected warning messages were logged (checked in one pass over the calls)
+    warn_msgs = {call_args.args[0] for call_args in mock_logger_warning.call_args_list if call_args.args}
+    assert {
+        "'add_metadata' for behavior 'AttributeError' under function 'TestFuncInvalidBehaviors' is not a dictionary. Skipping 'add_metadata'.",
+        "'log_to_specific_file' for behavior 'AttributeError' under function 'TestFuncInvalidBehaviors' is not a valid string. Skipping 'log_to_specific_file'.",
+        "Definition for behavior key 'default' under function 'TestFuncInvalidBehaviors' is not a dictionary. Skipping this behavior entry.",
+    } <= warn_msgs
 
 
 def test_load_exception_config_file_not_found(dynel_config_instance):
@@ -204,31 +247,31 @@ def test_load_exception_config_file_not_found(dynel_config_instance):
         dynel_config_instance.load_exception_config("non_existent_config")
 
 
-@pytest.mark.parametrize(
-    "ext,expected_exception,expected_match",
-    [
-        ("yaml", ValueError, r"Invalid DynEL configuration file .* Root of configuration must be a dictionary."),
-        ("json", ValueError, r"Failed to parse DynEL configuration file"),
-        ("toml", ValueError, r"Failed to parse DynEL configuration file"),
-    ],
-)
-def test_load_exception_config_invalid_format(
-    dynel_config_instance, ext, expected_exception, expected_match, tmp_path, monkeypatch
-):
-    filename_prefix = "invalid_config"
-    file_path = tmp_path / f"{filename_prefix}.{ext}"
-    with open(file_path, "w") as f:
-        f.write("this is not valid {syntax,, for all formats")
-
-    monkeypatch.chdir(tmp_path)
-    with patch('src.dynel.config.logger') as mock_logger: # Patch logger in src.dynel.config
-        with pytest.raises(expected_exception, match=expected_match):
-            dynel_config_instance.load_exception_config(filename_prefix)
+_ROOT_NOT_DICT_RE = re.compile(r"Invalid DynEL configuration file .* Root of configuration must be a dictionary.")
+_PARSE_FAILED_RE = re.compile(r"Failed to parse DynEL configuration file")
+_INVALID_PAYLOAD = b"this is not valid {syntax,, for all formats"
 
 
-@pytest.mark.parametrize("ext", ["json", "yaml", "toml"])
+def test_load_exception_config_invalid_format(
+    subtests, dynel_config_instance, tmp_path
+):
+    cases = [
+        ("yaml", _ROOT_NOT_DICT_RE),
+        ("json", _PARSE_FAILED_RE),
+        ("toml", _PARSE_FAILED_RE),
+    ]
+    with patch.object(dynel_config_module, "logger"): # Patch logger in src.dynel.config
+        for ext, expected_match in cases:
+            with subtests.test(ext=ext):
+                filename_prefix = f"invalid_config_{ext}"
+                (tmp_path / f"{filename_prefix}.{ext}").write_bytes(_INVALID_PAYLOAD)
+                with pytest.raises(ValueError, match=expected_match):
+                    dynel_config_instance.load_exception_config(filename_prefix, search_dir=tmp_path)
+
+
+@EXT_PARAMS
 def test_load_exception_config_safer_exception_loading(
-    temp_config_file_generator, dynel_config_instance, ext, tmp_path, monkeypatch
+    temp_config_file_generator, dynel_config_instance, ext
 ):
     config_data = {
         "debug_mode": False,
@@ -238,41 +281,136 @@ def test_load_exception_config_safer_exception_loading(
         "FuncWithUnresolvable": {"exceptions": ["nonexistent_module.NonExistentError"]},
     }
     filename_prefix = "test_exc_loading"
-    temp_config_file_generator(tmp_path, filename_prefix, ext, config_data)
+    config_path = temp_config_file_generator(filename_prefix, ext, config_data)
 
     mock_logger_warning = MagicMock()
     mock_logger_error = MagicMock() # For unexpected errors during loading
 
-    monkeypatch.chdir(tmp_path)
     # Patching logger directly in the 'config' module where load_exception_config is defined
-    with patch("src.dynel.config.logger.warning", mock_logger_warning), \
-         patch("src.dynel.config.logger.error", mock_logger_error):
-        dynel_config_instance.load_exception_config(filename_prefix)
+    with patch.object(dynel_config_module.logger, "warning", mock_logger_warning), \
+         patch.object(dynel_config_module.logger, "error", mock_logger_error):
+        dynel_config_instance.load_exception_config(filename_prefix, search_dir=config_path.parent)
 
     assert ValueError in dynel_config_instance.EXCEPTION_CONFIG["FuncWithBuiltin"]["exceptions"]
     assert not any(
         exc_type.__name__ == "DoesNotExist"
         for exc_type in dynel_config_instance.EXCEPTION_CONFIG["FuncWithBuiltin"]["exceptions"]
     )
-    # Check that 'DoesNotExist' was warned about. The exact error message might vary slightly.
-    found_warning_builtin = any(
-        call_args and call_args[0] and "DoesNotExist" in call_args[0][0] and "FuncWithBuiltin" in call_args[0][0]
-        for call_args in mock_logger_warning.call_args_list
-    )
-    assert found_warning_builtin, "Warning for 'DoesNotExist' not found or not as expected."
+    # Collect the warning messages once and check membership against the set
+    warn_msgs = {call_args.args[0] for call_args in mock_logger_warning.call_args_list if call_args.args}
 
+    # Check that 'DoesNotExist' was warned about. The exact error message might vary slightly.
+    assert any("DoesNotExist" in msg and "FuncWithBuiltin" in msg for msg in warn_msgs), \
+        "Warning for 'DoesNotExist' not found or not as expected."
 
     assert not dynel_config_instance.EXCEPTION_CONFIG["FuncWithImportable"]["exceptions"]
-    mock_logger_warning.assert_any_call(
-        "Could not load or validate exception 'os.PathLike' for 'FuncWithImportable': 'os.PathLike' is not an Exception subclass.. Skipping."
-    )
+    assert (
+        "Could not load or validate exception 'os.PathLike' for 'FuncWithImportable': 'os.PathLike' is not a BaseException subclass.. Skipping."
+    ) in warn_msgs
 
     assert not dynel_config_instance.EXCEPTION_CONFIG["FuncWithNonException"]["exceptions"]
-    mock_logger_warning.assert_any_call(
-        "Could not load or validate exception 'src.dynel.config.ContextLevel' for 'FuncWithNonException': 'src.dynel.config.ContextLevel' is not an Exception subclass.. Skipping."
-    )
+    assert (
+        "Could not load or validate exception 'src.dynel.config.ContextLevel' for 'FuncWithNonException': 'src.dynel.config.ContextLevel' is not a BaseException subclass.. Skipping."
+    ) in warn_msgs
 
     assert not dynel_config_instance.EXCEPTION_CONFIG["FuncWithUnresolvable"]["exceptions"]
-    mock_logger_warning.assert_any_call(
+    assert (
+        "Could not load or validate exception 'nonexistent_module.NonExistentError' for 'FuncWithUnresolvable': No module named 'nonexistent_module'. Skipping."
+    ) in warn_msgs
+
+
+def test_load_exception_config_reuses_resolved_exceptions(
+    temp_config_file_generator, dynel_config_instance
+):
+    config_data = {
+        "FuncA": {"exceptions": ["ValueError", "nonexistent_module.NonExistentError"]},
+        "FuncB": {"exceptions": ["ValueError", "nonexistent_module.NonExistentError"]},
+    }
+    filename_prefix = "test_exc_cache"
+    config_path = temp_config_file_generator(filename_prefix, "json", config_data)
+
+    with patch.object(dynel_config_module, "logger"):
+        dynel_config_instance.load_exception_config(filename_prefix, search_dir=config_path.parent)
+        dynel_config_module._CONFIG_CACHE.clear()  # Re-parse the file, but keep resolved names
+        dynel_config_instance.load_exception_config(filename_prefix, search_dir=config_path.parent)
+
+    cache_info = _resolve_exception_class.cache_info()
+    assert cache_info.misses == 2  # One resolution per distinct name
+    assert cache_info.hits == 6
+
+
+@EXT_PARAMS
+def test_load_exception_config_parses_unchanged_file_once(
+    temp_config_file_generator, dynel_config_instance, ext
+):
+    filename_prefix = "test_parse_cache"
+    config_path = temp_config_file_generator(filename_prefix, ext, VALID_CONFIG_DATA_DICT)
+
+    with patch.object(DynelConfig, "_load_config_file", autospec=True, side_effect=DynelConfig._load_config_file) as mock_load, \
+         patch.object(dynel_config_module, "logger"):
+        dynel_config_instance.load_exception_config(filename_prefix, search_dir=config_path.parent)
+        first_config = dynel_config_instance.EXCEPTION_CONFIG
+        dynel_config_instance.load_exception_config(filename_prefix, search_dir=config_path.parent)
+
+    mock_load.assert_called_once()
+    assert dynel_config_instance.EXCEPTION_CONFIG == first_config
+    # Read-only entries are shared between loads; only the top-level dict is new
+    assert dynel_config_instance.EXCEPTION_CONFIG is not first_config
+    assert dynel_config_instance.EXCEPTION_CONFIG["MyFunction"] is first_config["MyFunction"]
+    first_config.pop("MyFunction")
+    assert "MyFunction" in dynel_config_instance.EXCEPTION_CONFIG
+
+
+def test_load_exception_config_repeats_warnings_for_cached_file(temp_config_file_generator, dynel_config_instance):
+    config_data = {"FuncWithUnresolvable": {"exceptions": ["nonexistent_module.NonExistentError"]}}
+    filename_prefix = "test_cached_warnings"
+    config_path = temp_config_file_generator(filename_prefix, "json", config_data)
+    expected_warning = (
         "Could not load or validate exception 'nonexistent_module.NonExistentError' for 'FuncWithUnresolvable': No module named 'nonexistent_module'. Skipping."
     )
+
+    with patch.object(dynel_config_module, "logger") as mock_logger:
+        dynel_config_instance.load_exception_config(filename_prefix, search_dir=config_path.parent)
+        assert mock_logger.warning.call_args_list == [call(expected_warning)]
+        mock_logger.reset_mock()
+        dynel_config_instance.load_exception_config(filename_prefix, search_dir=config_path.parent)  # Served from the cache
+
+    assert mock_logger.warning.call_args_list == [call(expected_warning)]
+
+
+def test_clear_load_cache_forces_reparse(temp_config_file_generator, dynel_config_instance):
+    filename_prefix = "test_clear_load_cache"
+    config_path = temp_config_file_generator(filename_prefix, "json", VALID_CONFIG_DATA_DICT)
+
+    with patch.object(DynelConfig, "_load_config_file", autospec=True, side_effect=DynelConfig._load_config_file) as mock_load, \
+         patch.object(dynel_config_module, "logger"):
+        dynel_config_instance.load_exception_config(filename_prefix, search_dir=config_path.parent)
+        DynelConfig.clear_load_cache()
+        dynel_config_instance.load_exception_config(filename_prefix, search_dir=config_path.parent)
+
+    assert mock_load.call_count == 2
+    assert len(dynel_config_module._CONFIG_CACHE) == 1
+
+
+def test_load_exception_config_replaces_cache_entry_when_file_changes(tmp_path, dynel_config_instance):
+    config_file = tmp_path / "test_edited_config.json"
+    config_file.write_bytes(_json_dumps({"FuncA": {"custom_message": "first"}}))
+
+    with patch.object(dynel_config_module, "logger"):
+        dynel_config_instance.load_exception_config("test_edited_config", search_dir=tmp_path)
+        config_file.write_bytes(_json_dumps({"FuncA": {"custom_message": "second, edited"}}))
+        dynel_config_instance.load_exception_config("test_edited_config", search_dir=tmp_path)
+
+    assert dynel_config_instance.EXCEPTION_CONFIG["FuncA"]["custom_message"] == "second, edited"
+    assert len(dynel_config_module._CONFIG_CACHE) == 1  # The edit replaced the entry for this path
+
+
+def test_load_exception_config_searches_cwd_by_default(temp_config_file_generator, dynel_config_instance, monkeypatch):
+    filename_prefix = "test_cwd_lookup"
+    config_path = temp_config_file_generator(filename_prefix, "json", VALID_CONFIG_DATA_DICT)
+
+    monkeypatch.chdir(config_path.parent)
+    with patch.object(dynel_config_module, "logger"):
+        dynel_config_instance.load_exception_config(filename_prefix)
+
+    assert "MyFunction" in dynel_config_instance.EXCEPTION_CONFIG
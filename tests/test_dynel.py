@@ -1,22 +1,41 @@
 import pytest
 import warnings # Import warnings
 import sys # For sys.stderr
-from unittest.mock import patch # For mocking logger
+from unittest.mock import MagicMock # For mocking logger
+from loguru import logger as loguru_logger
+from src.dynel import dynel as legacy_dynel
 from src.dynel.dynel import DynelConfig, configure_logging, module_exception_handler
 
-def test_dynel_config_creation():
+
+# Built once; reset_mock() between tests is cheaper than constructing a new MagicMock.
+_LOGGER_MOCK = MagicMock(spec=loguru_logger)
+
+
+@pytest.fixture
+def mock_logger(monkeypatch):
+    """Swaps the logger used by src.dynel.dynel for a MagicMock for the test's duration."""
+    _LOGGER_MOCK.reset_mock()
+    monkeypatch.setattr(legacy_dynel, "logger", _LOGGER_MOCK)
+    return _LOGGER_MOCK
+
+
+def test_dynel_config_creation(monkeypatch):
     """Test DynelConfig creation with default and custom values."""
-    # Test default values with mocked sys.stderr.isatty()
-    with patch('sys.stderr.isatty', return_value=True):
-        config_default = DynelConfig()
-        assert config_default.context_level == "medium"
-        assert config_default.debug is False
-        assert config_default.formatting is True  # Test new default
-        assert config_default.colorize is True  # Should be True when stderr is a TTY
-
-    with patch('sys.stderr.isatty', return_value=False):
-        config_no_tty = DynelConfig()
-        assert config_no_tty.colorize is False  # Should be False when stderr is not a TTY
+    # Test default values with stubbed sys.stderr.isatty()
+    monkeypatch.setattr(sys.stderr, "isatty", lambda: True)
+    config_default = DynelConfig()
+    assert config_default.context_level == "medium"
+    assert config_default.debug is False
+    assert config_default.formatting is True  # Test new default
+    assert config_default.colorize is True  # Should be True when stderr is a TTY
+
+    # Test explicit colorize=False overrides isatty()
+    config_no_color = DynelConfig(colorize=False)
+    assert config_no_color.colorize is False  # Should respect explicit False
+
+    monkeypatch.setattr(sys.stderr, "isatty", lambda: False)
+    config_no_tty = DynelConfig()
+    assert config_no_tty.colorize is False  # Should be False when stderr is not a TTY
 
     # Test custom values
     config_custom = DynelConfig(
@@ -30,11 +49,6 @@ def test_dynel_config_creation():
     assert config_custom.formatting is False  # Test new custom value
     assert config_custom.colorize is True  # Should use explicitly set value
 
-    # Test explicit colorize=False overrides isatty()
-    with patch('sys.stderr.isatty', return_value=True):
-        config_no_color = DynelConfig(colorize=False)
-        assert config_no_color.colorize is False  # Should respect explicit False
-
 @pytest.mark.parametrize("config_params,expected_params", [
     # Debug mode, Formatted output
     (
@@ -57,51 +71,47 @@ def test_dynel_config_creation():
         }
     )
 ])
-def test_configure_logging(capsys, config_params, expected_params):
+def test_configure_logging(capsys, mock_logger, config_params, expected_params):
     """Test configure_logging with parameterized configurations."""
     config = DynelConfig(**config_params)
 
-    with warnings.catch_warnings(record=True) as w:
-        warnings.simplefilter('always')
-        with patch('src.dynel.dynel.logger') as mock_logger:
-            # Configure logging and verify handler tracking
-            configure_logging(config)
-            assert mock_logger.remove.call_count == len(mock_logger.remove.mock_calls)
-
-            # Verify console sink configuration
-            args_console, kwargs_console = mock_logger.add.call_args_list[0]
-            assert args_console[0] == sys.stderr
-            assert kwargs_console['level'] == expected_params['console_level']
-            if expected_params['simple_format']:
-                assert kwargs_console['format'] == expected_params['console_format']
-            else:
-                assert expected_params['console_format'] in kwargs_console['format']
-            assert kwargs_console['colorize'] == config.colorize
-
-            # Verify file sink configuration
-            args_file_log, kwargs_file_log = mock_logger.add.call_args_list[1]
-            assert args_file_log[0] == "dynel.log"
-            assert kwargs_file_log['level'] == expected_params['file_level']
-            assert kwargs_file_log['rotation'] == "10 MB"
-            assert kwargs_file_log['retention'] == "5 files"
-            assert kwargs_file_log['encoding'] == "utf8"
-            assert kwargs_file_log.get('serialize') is not True
-
-            # Verify JSON sink configuration
-            args_file_json, kwargs_file_json = mock_logger.add.call_args_list[2]
-            assert args_file_json[0] == "dynel.json"
-            assert kwargs_file_json['level'] == expected_params['file_level']
-            assert kwargs_file_json['serialize'] is True
-            assert kwargs_file_json['rotation'] == "10 MB"
-            assert kwargs_file_json['retention'] == "5 files"
-            assert kwargs_file_json['encoding'] == "utf8"
-
-            # Verify info message
-            mock_logger.info.assert_called_once_with(
-                f"DynEL logging configured. Console Level: {expected_params['console_level']}, "
-                f"File Level: {expected_params['file_level']}, Formatting: {config.formatting}"
-            )
-        assert len(w) == 0  # No unexpected warnings
+    # Configure logging and verify handler tracking
+    configure_logging(config)
+    assert mock_logger.remove.call_count == len(mock_logger.remove.mock_calls)
+
+    # Verify console sink configuration
+    args_console, kwargs_console = mock_logger.add.call_args_list[0]
+    assert args_console[0] == sys.stderr
+    assert kwargs_console['level'] == expected_params['console_level']
+    if expected_params['simple_format']:
+        assert kwargs_console['format'] == expected_params['console_format']
+    else:
+        assert expected_params['console_format'] in kwargs_console['format']
+    assert kwargs_console['colorize'] == config.colorize
+
+    # Verify file sink configuration
+    args_file_log, kwargs_file_log = mock_logger.add.call_args_list[1]
+    assert args_file_log[0] == "dynel.log"
+    assert kwargs_file_log['level'] == expected_params['file_level']
+    assert kwargs_file_log['rotation'] == "10 MB"
+    assert kwargs_file_log['retention'] == "5 files"
+    assert kwargs_file_log['encoding'] == "utf8"
+    assert kwargs_file_log.get('serialize') is not True
+
+    # Verify JSON sink configuration
+    args_file_json, kwargs_file_json = mock_logger.add.call_args_list[2]
+    assert args_file_json[0] == "dynel.json"
+    assert kwargs_file_json['level'] == expected_params['file_level']
+    assert kwargs_file_json['serialize'] is True
+    assert kwargs_file_json['rotation'] == "10 MB"
+    assert kwargs_file_json['retention'] == "5 files"
+    assert kwargs_file_json['encoding'] == "utf8"
+
+    # Verify info message
+    mock_logger.info.assert_called_once_with(
+        f"DynEL logging configured. Console Level: {expected_params['console_level']}, "
+        f"File Level: {expected_params['file_level']}, Formatting: {config.formatting}"
+    )
 
 @pytest.mark.parametrize("isatty_value,config_colorize,expected_colorize", [
     (True, None, True),    # TTY terminal, auto-detect
@@ -109,36 +119,24 @@ def test_configure_logging(capsys, config_params, expected_params):
     (True, False, False),   # TTY terminal, explicit disable
     (False, True, True),    # Non-TTY terminal, explicit enable
 ])
-def test_colorize_configuration(isatty_value, config_colorize, expected_colorize):
+def test_colorize_configuration(mock_logger, monkeypatch, isatty_value, config_colorize, expected_colorize):
     """Test colorize configuration with various terminal and explicit settings."""
-    with patch('sys.stderr.isatty', return_value=isatty_value):
-        config = DynelConfig(colorize=config_colorize)
-        with patch('src.dynel.dynel.logger') as mock_logger:
-            configure_logging(config)
-            # Verify colorize setting was passed correctly to console sink
-            _, kwargs = mock_logger.add.call_args_list[0]
-            assert kwargs['colorize'] == expected_colorize
+    monkeypatch.setattr(sys.stderr, "isatty", lambda: isatty_value)
+    config = DynelConfig(colorize=config_colorize)
+    configure_logging(config)
+    # Verify colorize setting was passed correctly to console sink
+    _, kwargs = mock_logger.add.call_args_list[0]
+    assert kwargs['colorize'] == expected_colorize
 
-    config = DynelConfig(context_level="minimal", debug=False, formatting=True)
 
-    with warnings.catch_warnings(record=True) as w:
-        warnings.simplefilter('always') # Ensure warnings are caught for this context
-        configure_logging(config)
+class DummyModule: # Class name is "DummyModule"
+    __name__ = "TestModule" # Attribute __name__ is "TestModule"
 
-        assert len(w) == 1
-        assert issubclass(w[-1].category, UserWarning)
-        assert "configure_logging is a placeholder" in str(w[-1].message)
-
-    captured = capsys.readouterr()
-    assert "Logging configured with context level: minimal, Debug: False, Formatting: True (placeholder, no real logging setup)" in captured.out
 
 def test_module_exception_handler_placeholder(capsys, recwarn): # Keep recwarn for now, might remove if not used
     """Test the placeholder module_exception_handler function and warning."""
     config = DynelConfig()
 
-    class DummyModule: # Class name is "DummyModule"
-        __name__ = "TestModule" # Attribute __name__ is "TestModule"
-
     with warnings.catch_warnings(record=True) as w:
         warnings.simplefilter('always') # Ensure warnings are caught for this context
         module_exception_handler(config, DummyModule) # Passing the class itself
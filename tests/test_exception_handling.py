@@ -1,59 +1,92 @@
 import pytest
 import inspect
-from unittest.mock import patch, Mock, MagicMock
-import importlib.util # For dummy_module fixture
+import json
+import threading
+import types
+from collections import deque
+from unittest.mock import patch
 
 # Importing from the new locations in src.dynel
+from src.dynel import exception_handling as exception_handling_module
 from src.dynel.config import DynelConfig, ContextLevel
-from src.dynel.exception_handling import handle_exception, module_exception_handler
+from src.dynel.exception_handling import close_mirror_handlers, handle_exception, module_exception_handler
 # Import the actual logger instance for direct manipulation in tests if needed
 from loguru import logger as dynel_logger_instance # Renamed
 
 
-@pytest.fixture
-def dynel_config_instance():
-    """Returns a default DynelConfig instance."""
-    return DynelConfig()
+# The capturing sink only keeps records, so Loguru has nothing to format.
+_SINK_FMT = ""
 
-@pytest.fixture
-def captured_logs():
-    """Fixture to capture Loguru logs in a list."""
-    log_capture_list = []
+
+@pytest.fixture(scope="session", autouse=True)
+def _capture_sink():
+    """Registers a single Loguru capturing sink for the whole session."""
+    log_capture_list = deque()
 
     def capturing_sink(message):
-        log_capture_list.append(message.record)
+        # Tests only read the exception's type and value, so store a copy without the
+        # traceback. The shared record is left intact for other sinks, and the
+        # exception's own __traceback__ is kept because it may still be re-raised.
+        record = message.record
+        exception = record["exception"]
+        if exception is not None and exception.traceback is not None:
+            record = {**record, "exception": exception._replace(traceback=None)}
+        log_capture_list.append(record)
 
     # Use the specific logger instance from the dynel package
-    handler_id = dynel_logger_instance.add(capturing_sink, format="{message}")
+    # Records are read directly, so skip Loguru's traceback rendering (backtrace/diagnose)
+    handler_id = dynel_logger_instance.add(
+        capturing_sink, format=_SINK_FMT, backtrace=False, diagnose=False, catch=False
+    )
     yield log_capture_list
-    dynel_logger_instance.remove(handler_id)
+    try:
+        dynel_logger_instance.remove(handler_id)
+    except ValueError:
+        # Another test already removed every handler
+        pass
+
+@pytest.fixture
+def captured_logs(_capture_sink):
+    """Fixture to capture Loguru log records in a deque, emptied before each test."""
+    _capture_sink.clear()
+    return _capture_sink
+
+class _CallRecorder:
+    """Stands in for a patched callable and records the positional arguments of each call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append(args)
+
+# Read-only environment used by the context-level tests; built once per module.
+# The patched ``os.environ`` must stay mutable (pytest sets PYTEST_CURRENT_TEST),
+# so tests install a plain copy and compare against this frozen view.
+_MOCK_ENV = types.MappingProxyType({"TEST_VAR": "test_value"})
 
 # --- Tests for handle_exception ---
 
-def test_handle_exception_basic_logging(dynel_config_instance, captured_logs):
+def test_handle_exception_basic_logging(dynel_config_instance, captured_logs, fake_stack):
     config = dynel_config_instance
     error_to_raise = ValueError("Test error for basic logging")
+    fake_stack("mock_function_raising_error")
 
-    with patch("src.dynel.exception_handling.inspect.stack") as mock_stack: # Patch inspect in exception_handling
-        mock_function_name = "mock_function_raising_error"
-        mock_caller_frame_tuple = (Mock(), "filename_mock", 123, mock_function_name, ["code_line_mock"], 0)
-        mock_stack.return_value = [Mock(), mock_caller_frame_tuple]
-
-        try:
-            raise error_to_raise
-        except ValueError as e:
-            handle_exception(config, e)
+    try:
+        raise error_to_raise
+    except ValueError as e:
+        handle_exception(config, e)
 
     assert len(captured_logs) == 1
     log_record = captured_logs[0]
     assert log_record["level"].name == "ERROR"
-    assert "Exception caught in mock_function_raising_error" in log_record["message"]
+    assert log_record["message"] == "Exception caught in mock_function_raising_error"
     assert log_record["exception"] is not None
-    assert "Test error for basic logging" in str(log_record["exception"].value)
+    assert log_record["exception"].value.args[0] == "Test error for basic logging"
     assert "timestamp" in log_record["extra"]
 
 
-def test_handle_exception_with_custom_message_and_tags(dynel_config_instance, captured_logs):
+def test_handle_exception_with_custom_message_and_tags(dynel_config_instance, captured_logs, fake_stack):
     config = dynel_config_instance
     func_name = "my_specific_function"
     custom_msg = "A very specific error occurred!"
@@ -63,15 +96,12 @@ def test_handle_exception_with_custom_message_and_tags(dynel_config_instance, ca
         func_name: {"exceptions": [TypeError], "custom_message": custom_msg, "tags": tags}
     }
     error_to_raise = TypeError("Something went wrong with types")
+    fake_stack(func_name)
 
-    with patch("src.dynel.exception_handling.inspect.stack") as mock_stack: # Patch inspect in exception_handling
-        mock_caller_frame_tuple = (Mock(), "filename_mock", 123, func_name, ["code_line_mock"], 0)
-        mock_stack.return_value = [Mock(), mock_caller_frame_tuple]
-
-        try:
-            raise error_to_raise
-        except TypeError as e:
-            handle_exception(config, e)
+    try:
+        raise error_to_raise
+    except TypeError as e:
+        handle_exception(config, e)
 
     assert len(captured_logs) == 1
     log_record = captured_logs[0]
@@ -79,85 +109,108 @@ def test_handle_exception_with_custom_message_and_tags(dynel_config_instance, ca
     expected_log_message = f"Exception caught in {func_name} - Custom Message: {custom_msg}"
     assert log_record["message"] == expected_log_message
     assert log_record["exception"] is not None
-    assert "Something went wrong with types" in str(log_record["exception"].value)
+    assert log_record["exception"].value.args[0] == "Something went wrong with types"
     assert log_record["extra"]["tags"] == tags
     assert "timestamp" in log_record["extra"]
 
 
-@pytest.mark.parametrize(
-    "level_str, expected_keys_in_extra",
-    [
-        ("min", ["timestamp"]),
-        ("med", ["timestamp", "local_vars"]),
-        ("det", ["timestamp", "local_vars", "free_memory", "cpu_count", "env_details"]),
-    ],
-)
-def test_handle_exception_context_levels(level_str, expected_keys_in_extra, captured_logs, monkeypatch): # Added monkeypatch
-    mock_os_environ = {"TEST_VAR": "test_value"}
-    # Patch os.environ where it's used: in src.dynel.exception_handling
-    monkeypatch.setattr("src.dynel.exception_handling.os.environ", mock_os_environ)
-    # Patch os.sysconf and os.cpu_count as well
-    monkeypatch.setattr("src.dynel.exception_handling.os.sysconf", lambda name: 1024 if name == "SC_PAGE_SIZE" else 1000 if name == "SC_AVPHYS_PAGES" else 0) # Mock sysconf
-    monkeypatch.setattr("src.dynel.exception_handling.os.cpu_count", lambda: 4) # Mock cpu_count
-
-
-    with patch("src.dynel.exception_handling.inspect.stack") as mock_stack: # Patch inspect in exception_handling
-        config = DynelConfig(context_level=level_str)
-        mock_function_name = "context_level_test_func"
-        mock_caller_frame_object = Mock()
-        mock_caller_frame_object.f_locals = {"var1": 10, "var2": "test"}
-        mock_caller_frame_info_tuple = (mock_caller_frame_object, "filename_mock", 123, mock_function_name, ["code_line_mock"], 0)
-        mock_stack.return_value = [Mock(), mock_caller_frame_info_tuple]
-
-        error_to_raise = ConnectionError("A connection problem")
-        try:
-            raise error_to_raise
-        except ConnectionError as e:
-            handle_exception(config, e)
+@pytest.fixture(scope="session", params=["min", "med", "det"])
+def ctx_config(request):
+    """One DynelConfig per context level, built once per session."""
+    return DynelConfig(context_level=request.param)
+
+_EXPECTED_KEYS_BY_CONTEXT_LEVEL = {
+    ContextLevel.MINIMAL: ["timestamp"],
+    ContextLevel.MEDIUM: ["timestamp", "local_vars"],
+    ContextLevel.DETAILED: ["timestamp", "local_vars", "free_memory", "cpu_count", "env_details"],
+}
+
+_MOCK_SYSCONF = {"SC_PAGE_SIZE": 1024, "SC_AVPHYS_PAGES": 1000}
+
+@pytest.fixture
+def patched_host(monkeypatch):
+    """Installs a fixed environment, page counts and CPU count for the detailed context."""
+    host_os = exception_handling_module.os
+    monkeypatch.setattr(host_os, "environ", dict(_MOCK_ENV))
+    monkeypatch.setattr(host_os, "sysconf", lambda name: _MOCK_SYSCONF.get(name, 0))
+    monkeypatch.setattr(host_os, "cpu_count", lambda: 4)
+    # Drop host values cached by earlier tests, and the fake ones afterwards
+    exception_handling_module._page_size.cache_clear()
+    exception_handling_module._cpu_count.cache_clear()
+    yield
+    exception_handling_module._page_size.cache_clear()
+    exception_handling_module._cpu_count.cache_clear()
+
+def test_handle_exception_context_levels(ctx_config, captured_logs, patched_host, fake_stack):
+    expected_keys_in_extra = _EXPECTED_KEYS_BY_CONTEXT_LEVEL[ctx_config.CUSTOM_CONTEXT_LEVEL]
+    config = ctx_config
+    mock_function_name = "context_level_test_func"
+    fake_stack(mock_function_name, {"var1": 10, "var2": "test"})
+
+    error_to_raise = ConnectionError("A connection problem")
+    try:
+        raise error_to_raise
+    except ConnectionError as e:
+        handle_exception(config, e)
 
     assert len(captured_logs) == 1
     log_record = captured_logs[0]
     assert log_record["level"].name == "ERROR"
-    assert f"Exception caught in {mock_function_name}" in log_record["message"]
+    assert log_record["message"] == f"Exception caught in {mock_function_name}"
     assert log_record["exception"] is not None
-    assert "A connection problem" in str(log_record["exception"].value)
+    assert log_record["exception"].value.args[0] == "A connection problem"
 
-    for key in expected_keys_in_extra:
-        assert key in log_record["extra"]
+    assert set(expected_keys_in_extra) <= set(log_record["extra"])
 
     if "local_vars" in expected_keys_in_extra:
-        assert "'var1': 10" in log_record["extra"]["local_vars"]
-        assert "'var2': 'test'" in log_record["extra"]["local_vars"]
+        assert log_record["extra"]["local_vars"] == {"var1": "10", "var2": "'test'"}
+    if "free_memory" in expected_keys_in_extra:
+        assert log_record["extra"]["free_memory"] == 1024 * 1000
+        assert log_record["extra"]["cpu_count"] == 4
     if "env_details" in expected_keys_in_extra:
-        assert log_record["extra"]["env_details"] == mock_os_environ
+        # pytest adds PYTEST_CURRENT_TEST to the patched environment once the call phase starts
+        env_details = dict(log_record["extra"]["env_details"])
+        env_details.pop("PYTEST_CURRENT_TEST", None)
+        assert env_details == _MOCK_ENV
 
 
-def test_handle_exception_panic_mode(dynel_config_instance, captured_logs):
+def test_handle_exception_panic_mode(dynel_config_instance, captured_logs, fake_stack, monkeypatch):
     config = dynel_config_instance
     config.PANIC_MODE = True
     error_to_raise = RuntimeError("Critical system failure!")
     func_name = "panicking_function"
 
-    # Patch sys.exit within the exception_handling module
-    with patch("src.dynel.exception_handling.inspect.stack") as mock_stack, \
-         patch("src.dynel.exception_handling.sys.exit") as mock_sys_exit:
-        mock_caller_frame_tuple = (Mock(), "filename_mock", 123, func_name, ["code_line_mock"], 0)
-        mock_stack.return_value = [Mock(), mock_caller_frame_tuple]
+    fake_stack(func_name)
+
+    # Record sys.exit calls instead of exiting
+    exit_codes = []
+    monkeypatch.setattr(exception_handling_module.sys, "exit", exit_codes.append)
+    try:
+        raise error_to_raise
+    except RuntimeError as e:
+        handle_exception(config, e)
+
+    # Only levels and messages matter here: the exception log, then the panic log
+    assert [(record["level"].name, record["message"]) for record in captured_logs] == [
+        ("ERROR", f"Exception caught in {func_name}"),
+        ("CRITICAL", f"PANIC MODE ENABLED: Exiting after handling exception in {func_name}."),
+    ]
+    assert exit_codes == [1]
 
-        try:
-            raise error_to_raise
-        except RuntimeError as e:
-            handle_exception(config, e)
 
-    assert len(captured_logs) == 2 # Exception log + panic log
-    exception_log = captured_logs[0]
-    panic_log = captured_logs[1]
+def test_handle_exception_truncates_large_local_vars(captured_logs, fake_stack):
+    config = DynelConfig(context_level="med")
+    fake_stack("big_locals_func", {"big_list": list(range(10_000)), "big_str": "x" * 10_000})
 
-    assert exception_log["level"].name == "ERROR"
-    assert f"Exception caught in {func_name}" in exception_log["message"]
-    assert panic_log["level"].name == "CRITICAL"
-    assert f"PANIC MODE ENABLED: Exiting after handling exception in {func_name}." in panic_log["message"]
-    mock_sys_exit.assert_called_once_with(1)
+    try:
+        raise ValueError("Large locals")
+    except ValueError as e:
+        handle_exception(config, e)
+
+    local_vars = captured_logs[0]["extra"]["local_vars"]
+    assert local_vars["big_list"].endswith("...]")
+    assert len(local_vars["big_list"]) < 200
+    assert len(local_vars["big_str"]) <= 200
 
 
 # --- Tests for module_exception_handler ---
@@ -175,82 +228,145 @@ class SomeClass:
         raise AttributeError("Dummy AttributeError in class")
 """
 
+def _snapshot_callables(module):
+    """Records module-level callables and class members so in-place wrapping can be undone."""
+    snapshot = []
+    for name, value in vars(module).items():
+        if callable(value):
+            snapshot.append((module, name, value))
+        if inspect.isclass(value):
+            for attr_name, attr_value in vars(value).items():
+                if callable(attr_value) or isinstance(attr_value, (staticmethod, classmethod)):
+                    snapshot.append((value, attr_name, attr_value))
+    return snapshot
+
+def _module_from_code(name, code):
+    """Executes a precompiled code object in a fresh module named ``name``."""
+    module = types.ModuleType(name)
+    exec(code, module.__dict__)
+    return module
+
+_DUMMY_CODE = compile(DUMMY_MODULE_CONTENT, "<dummy_module_for_dynel_test>", "exec")
+
+@pytest.fixture(scope="session")
+def _dummy_module_session():
+    imported_module = _module_from_code("dummy_module_for_dynel_test", _DUMMY_CODE)
+    return imported_module, _snapshot_callables(imported_module)
+
 @pytest.fixture
-def dummy_module(tmp_path):
-    module_path = tmp_path / "dummy_module_for_dynel_test.py"
-    module_path.write_text(DUMMY_MODULE_CONTENT)
-    spec = importlib.util.spec_from_file_location("dummy_module_for_dynel_test", module_path)
-    imported_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(imported_module)
-    return imported_module
-
-def test_module_exception_handler_wraps_functions(dynel_config_instance, dummy_module, captured_logs):
+def dummy_module(_dummy_module_session):
+    """The session's dummy module, with its original functions restored after each test."""
+    imported_module, originals = _dummy_module_session
+    yield imported_module
+    for owner, name, value in originals:
+        setattr(owner, name, value)
+
+def test_module_exception_handler_wraps_functions(dynel_config_instance, dummy_module, captured_logs, monkeypatch):
     config = dynel_config_instance
-    # Patch handle_exception where it's called by module_exception_handler's _onerror_handler
-    # which is within src.dynel.exception_handling
-    with patch("src.dynel.exception_handling.handle_exception") as mock_handle_exception:
-        # Mock logger.debug as well if checking debug logs from module_exception_handler
-        with patch("src.dynel.exception_handling.logger.debug") as mock_logger_debug:
-            module_exception_handler(config, dummy_module)
-
-            assert dummy_module.func_that_works() == "worked"
-            with pytest.raises(ValueError, match="Dummy ValueError"):
-                dummy_module.func_that_raises_value_error()
-
-            mock_handle_exception.assert_called_once()
-            args, _ = mock_handle_exception.call_args
-            assert args[0] == config
-            assert isinstance(args[1], ValueError)
-            assert str(args[1]) == "Dummy ValueError"
-
-            if config.DEBUG_MODE: # Only assert debug log if debug mode was on (it's off by default for fixture)
-                 mock_logger_debug.assert_any_call("Wrapped function: %s in module %s", "func_that_works", "dummy_module_for_dynel_test")
-                 mock_logger_debug.assert_any_call("Wrapped function: %s in module %s", "func_that_raises_value_error", "dummy_module_for_dynel_test")
-
+    # Record calls to handle_exception where module_exception_handler's wrappers
+    # look it up, in src.dynel.exception_handling
+    handled = _CallRecorder()
+    monkeypatch.setattr(exception_handling_module, "handle_exception", handled)
+    module_exception_handler(config, dummy_module)
+
+    assert dummy_module.func_that_works() == "worked"
+    with pytest.raises(ValueError, match="Dummy ValueError"):
+        dummy_module.func_that_raises_value_error()
+
+    assert len(handled.calls) == 1
+    handled_config, handled_error = handled.calls[0]
+    assert handled_config is config
+    assert isinstance(handled_error, ValueError)
+    assert handled_error.args[0] == "Dummy ValueError"
+    monkeypatch.undo()  # The real handle_exception takes the class method's error below
 
     assert dummy_module._a_private_variable is True
     assert inspect.isclass(dummy_module.SomeClass)
     instance = dummy_module.SomeClass()
     with pytest.raises(AttributeError, match="Dummy AttributeError in class"):
         instance.method()
-    # mock_handle_exception should still be called once from the module-level function that raised
-    mock_handle_exception.assert_called_once()
 
 
-def test_module_exception_handler_debug_logging(dynel_config_instance, dummy_module):
+def test_module_exception_handler_debug_logging(dynel_config_instance, dummy_module, monkeypatch):
     config = dynel_config_instance
     config.DEBUG_MODE = True # Enable debug mode
 
-    with patch("src.dynel.exception_handling.handle_exception"), \
-         patch("src.dynel.exception_handling.logger.debug") as mock_logger_debug: # Patch logger in exception_handling
-
-        module_exception_handler(config, dummy_module)
-
-        # Check if logger.debug was called for the functions in dummy_module
-        # Exact module name might vary based on how dummy_module is loaded.
-        # The fixture uses "dummy_module_for_dynel_test"
-        mock_logger_debug.assert_any_call("Wrapped function: %s in module %s", "func_that_works", "dummy_module_for_dynel_test")
-        mock_logger_debug.assert_any_call("Wrapped function: %s in module %s", "func_that_raises_value_error", "dummy_module_for_dynel_test")
-        # Ensure it wasn't called for non-functions
-        for call_arg in mock_logger_debug.call_args_list:
-            assert "_a_private_variable" not in call_arg[0][1] # Corrected assertion for string check
-            assert "SomeClass" not in call_arg[0][1] # Corrected assertion for string check
+    logged_debug = _CallRecorder()
+    monkeypatch.setattr(exception_handling_module, "handle_exception", _CallRecorder())
+    monkeypatch.setattr(exception_handling_module.logger, "debug", logged_debug) # Patch logger in exception_handling
+
+    module_exception_handler(config, dummy_module)
+
+    # Check if logger.debug was called for the functions in dummy_module
+    # Exact module name might vary based on how dummy_module is loaded.
+    # The fixture uses "dummy_module_for_dynel_test"
+    seen = set(logged_debug.calls)
+    assert ("Wrapped function/staticmethod: %s in module %s", "func_that_works", "dummy_module_for_dynel_test") in seen
+    assert ("Wrapped function/staticmethod: %s in module %s", "func_that_raises_value_error", "dummy_module_for_dynel_test") in seen
+    # Ensure no function-level message was logged for non-functions
+    for call_args in logged_debug.calls:
+        if call_args[0] == "Wrapped function/staticmethod: %s in module %s":
+            assert call_args[1] not in ("_a_private_variable", "SomeClass")
+
+
+def test_module_exception_handler_skips_imported_classes(dynel_config_instance):
+    module = types.ModuleType("reexporting_module_for_dynel_test")
+    exec(
+        "import os.path\nfrom os.path import join\nfrom collections import UserList\n"
+        "def own_func():\n    return 1\n",
+        module.__dict__,
+    )
+    original_append = vars(module.UserList)["append"]
+
+    module_exception_handler(dynel_config_instance, module)
+
+    # Imported functions are rebound in this module only; the source module is untouched
+    assert hasattr(module.join, "__wrapped__")
+    assert not hasattr(module.os.path.join, "__wrapped__")
+    assert vars(module.UserList)["append"] is original_append
+    assert hasattr(module.own_func, "__wrapped__")
+    assert module.own_func() == 1
+
+
+def test_module_exception_handler_keeps_static_and_class_method_descriptors(dynel_config_instance, monkeypatch):
+    module = _module_from_code("descriptor_module_for_dynel_test", compile(
+        "class Holder:\n"
+        "    @staticmethod\n"
+        "    def static_bad():\n"
+        "        raise TypeError('static')\n"
+        "    @classmethod\n"
+        "    def class_bad(cls):\n"
+        "        raise KeyError(cls.__name__)\n",
+        "<descriptor_module_for_dynel_test>", "exec",
+    ))
+    handled = _CallRecorder()
+    monkeypatch.setattr(exception_handling_module, "handle_exception", handled)
+
+    module_exception_handler(dynel_config_instance, module)
+
+    assert isinstance(vars(module.Holder)["static_bad"], staticmethod)
+    assert isinstance(vars(module.Holder)["class_bad"], classmethod)
+    with pytest.raises(TypeError, match="static"):
+        module.Holder().static_bad()
+    with pytest.raises(KeyError, match="Holder"):
+        module.Holder.class_bad()
+    assert [type(error) for _, error in handled.calls] == [TypeError, KeyError]
 
 
 # --- Tests for New Behavior Implementations ---
 
-@pytest.fixture
-def config_with_behaviors(tmp_path):
+@pytest.fixture(scope="module")
+def _behavior_config_module(tmp_path_factory):
     """
-    Provides a DynelConfig instance with preloaded behavior configurations
-    and sets up a temporary logs directory.
+    Builds the DynelConfig with preloaded behavior configurations and a
+    temporary logs directory once for the module.
     """
     config = DynelConfig()
     # Create a temporary logs directory for specific file logging
     # This path needs to be accessible by the code being tested.
     # We assume for PoC that the log file paths in config are relative like "logs/error.log"
-    # or absolute. For testing, we make them relative to tmp_path.
-    log_dir = tmp_path / "logs"
+    # or absolute. For testing, we make them relative to a module temp directory.
+    log_dir = tmp_path_factory.mktemp("behaviors") / "logs"
     log_dir.mkdir(exist_ok=True)
 
     config.EXCEPTION_CONFIG = {
@@ -265,9 +381,9 @@ def config_with_behaviors(tmp_path):
                 },
                 "TypeError": {
                     "add_metadata": {"error_code": "TE001", "hint": "Check types"}
-                    # No specific log file for TypeError, should go to main only
+                    # No log file of its own: the default's log_to_specific_file still applies
                 },
-                "default": { # For KeyError
+                "default": { # All of KeyError; TypeError's log file
                     "add_metadata": {"default_applied": True, "severity": "Low"},
                     "log_to_specific_file": str(log_dir / "default_behavior_errors.log")
                 }
@@ -277,156 +393,170 @@ def config_with_behaviors(tmp_path):
     return config, log_dir
 
 
-def test_handle_exception_add_metadata_behavior(config_with_behaviors, captured_logs):
-    config, _ = config_with_behaviors
-    error_to_raise = ValueError("Test VE with metadata")
-    func_name = "behavior_func"
+@pytest.fixture
+def config_with_behaviors(_behavior_config_module):
+    """
+    Provides the shared behavior DynelConfig and its logs directory.
+    """
+    yield _behavior_config_module
+    # Mirror handlers persist once added; close this test's files
+    close_mirror_handlers()
 
-    with patch("src.dynel.exception_handling.inspect.stack") as mock_stack:
-        mock_caller_frame_tuple = (Mock(), "filename_mock", 123, func_name, ["code_line_mock"], 0)
-        mock_stack.return_value = [Mock(), mock_caller_frame_tuple]
-        try:
-            raise error_to_raise
-        except ValueError as e:
-            handle_exception(config, e)
 
-    assert len(captured_logs) >= 1 # Main log
-    main_log_record = captured_logs[0] # Assuming first is main if no specific file log for this one
+@pytest.mark.parametrize(
+    "exc_type, exc_message, expected_extra, absent_keys, mirror_filename, mirror_extra, absent_files",
+    [
+        pytest.param(
+            ValueError, "Test VE with metadata",
+            {"error_code": "VE001", "source": "validation", "tags": ["behavior_test"]}, (),
+            None, {}, (),
+            id="add_metadata",
+        ),
+        pytest.param(
+            ValueError, "Test VE for specific file",
+            {}, (),
+            "value_errors.log", {"error_code": "VE001", "source": "validation"}, (),
+            id="log_to_specific_file",
+        ),
+        pytest.param(
+            KeyError, "Test KeyError for default behavior",
+            {"default_applied": True, "severity": "Low"}, ("error_code",),
+            "default_behavior_errors.log", {"default_applied": True}, (),
+            id="default_behavior_override",
+        ),
+        # Specific actions override the default's per action: TypeError's add_metadata replaces
+        # the default one, while the default log_to_specific_file still applies.
+        pytest.param(
+            TypeError, "Test TypeError for metadata only",
+            {"error_code": "TE001", "hint": "Check types"}, ("default_applied",),
+            "default_behavior_errors.log", {"error_code": "TE001"}, ("value_errors.log",),
+            id="specific_metadata_with_default_file",
+        ),
+    ],
+)
+def test_handle_exception_behaviors(
+    config_with_behaviors, captured_logs, fake_stack,
+    exc_type, exc_message, expected_extra, absent_keys, mirror_filename, mirror_extra, absent_files,
+):
+    config, log_dir = config_with_behaviors
+    func_name = "behavior_func"
+
+    # The logs directory is shared across this module; start without the files this case checks
+    for filename in (mirror_filename, *absent_files):
+        if filename is not None:
+            (log_dir / filename).unlink(missing_ok=True)
 
-    # Check for specific log if applicable, or just main log if not
-    # In this case, ValueError also logs to a specific file, so there might be more logs.
-    # We are interested in the metadata in the *main* log record primarily.
-    # The log_to_specific_file might also add a log entry to captured_logs if its handler_id is not correctly managed
-    # or if it's also captured by the main test sink.
+    fake_stack(func_name)
+    try:
+        raise exc_type(exc_message)
+    except exc_type as e:
+        handle_exception(config, e)
+    dynel_logger_instance.complete() # Mirror handlers write from Loguru's enqueue worker
 
     # Find the primary error log entry (not the one from specific file logging)
-    primary_error_log = None
-    for rec in captured_logs:
-        if rec["level"].name == "ERROR" and "Exception caught in behavior_func" in rec["message"]:
-            primary_error_log = rec
-            break
+    primary_error_log = next(
+        (
+            rec for rec in captured_logs
+            if rec["level"].name == "ERROR" and "Exception caught in behavior_func" in rec["message"]
+        ),
+        None,
+    )
     assert primary_error_log is not None, "Primary error log not found"
-
-    assert "error_code" in primary_error_log["extra"]
-    assert primary_error_log["extra"]["error_code"] == "VE001"
-    assert "source" in primary_error_log["extra"]
-    assert primary_error_log["extra"]["source"] == "validation"
-    assert "tags" in primary_error_log["extra"] # Ensure tags are still there
-    assert primary_error_log["extra"]["tags"] == ["behavior_test"]
-
-
-def test_handle_exception_log_to_specific_file_behavior(config_with_behaviors, captured_logs, tmp_path):
+    for key, value in expected_extra.items():
+        assert primary_error_log["extra"][key] == value
+    for key in absent_keys:
+        assert key not in primary_error_log["extra"]
+
+    # Check the specific log file the behavior mirrors to
+    if mirror_filename is not None:
+        mirror_log_file = log_dir / mirror_filename
+        assert mirror_log_file.exists()
+        # Only the first entry is needed; read it without loading the whole file
+        with open(mirror_log_file, 'r') as f:
+            first_line = f.readline()
+        assert first_line.strip()
+        mirror_log_record = json.loads(first_line)["record"] # Serialized lines nest the record
+
+        assert mirror_log_record["message"].startswith("[Mirrored to ")
+        assert exc_message in mirror_log_record["exception"]["value"]
+        for key, value in mirror_extra.items(): # Metadata should also be in specific log
+            assert mirror_log_record["extra"][key] == value
+
+    # Assert that no specific error log files were created where none apply
+    for filename in absent_files:
+        assert not (log_dir / filename).exists()
+
+
+def test_handle_exception_mirror_handler_is_reused_and_readded(config_with_behaviors, captured_logs, fake_stack, monkeypatch):
     config, log_dir = config_with_behaviors
-    error_to_raise = ValueError("Test VE for specific file")
-    func_name = "behavior_func"
     specific_log_file = log_dir / "value_errors.log"
+    specific_log_file.unlink(missing_ok=True) # The logs directory is shared across this module
+    fake_stack("behavior_func")
 
-    # Ensure the specific log file does not exist before the test
-    if specific_log_file.exists():
-        specific_log_file.unlink()
-    assert not specific_log_file.exists()
-
-    with patch("src.dynel.exception_handling.inspect.stack") as mock_stack:
-        mock_caller_frame_tuple = (Mock(), "filename_mock", 123, func_name, ["code_line_mock"], 0)
-        mock_stack.return_value = [Mock(), mock_caller_frame_tuple]
+    def raise_and_handle():
         try:
-            raise error_to_raise
+            raise ValueError("Mirrored VE")
         except ValueError as e:
             handle_exception(config, e)
 
-    # Check main log
-    assert any(rec["level"].name == "ERROR" and "Exception caught in behavior_func" in rec["message"] for rec in captured_logs)
+    raise_and_handle()
+    raise_and_handle()
+    assert len(exception_handling_module._MIRROR_HANDLERS) == 1  # One handler serves both exceptions
 
-    # Check specific log file
-    assert specific_log_file.exists()
-    with open(specific_log_file, 'r') as f:
-        specific_log_content = f.read()
+    handler_id, _ = exception_handling_module._MIRROR_HANDLERS[str(specific_log_file)]
+    # A new format replaces the cached handler
+    monkeypatch.setattr(config, "AUX_LOG_FORMAT", "{time} | {level} | {message}")
+    raise_and_handle()
+    assert exception_handling_module._MIRROR_HANDLERS[str(specific_log_file)][0] != handler_id
+    with pytest.raises(ValueError):
+        dynel_logger_instance.remove(handler_id)  # Removed when it was replaced
+    dynel_logger_instance.complete()
 
-    import json # to parse JSON log lines
-    lines = specific_log_content.strip().split('\n')
-    assert len(lines) > 0
-    specific_log_json = json.loads(lines[0]) # Assuming one log line for PoC
+    # One JSON object per line; parse them as a single array in one call
+    records = json.loads(b"[" + b",".join(specific_log_file.read_bytes().splitlines()) + b"]")
+    assert len(records) == 3
+    assert all(entry["record"]["message"].startswith("[Mirrored to ") for entry in records)
+    # Re-adding the handler does not log the mirrored record twice to the other sinks
+    assert sum(rec["message"].startswith("[Mirrored to ") for rec in captured_logs) == 3
 
-    assert "[Mirrored to " in specific_log_json["message"]
-    assert "Test VE for specific file" in specific_log_json["exception"]["value"]
-    assert specific_log_json["extra"]["error_code"] == "VE001" # Metadata should also be in specific log
-    assert specific_log_json["extra"]["source"] == "validation"
 
-
-def test_handle_exception_default_behavior_override(config_with_behaviors, captured_logs, tmp_path):
+def test_handle_exception_mirrors_each_record_once_across_threads(config_with_behaviors, captured_logs, fake_stack):
     config, log_dir = config_with_behaviors
-    error_to_raise = KeyError("Test KeyError for default behavior")
-    func_name = "behavior_func"
-    default_log_file = log_dir / "default_behavior_errors.log"
-
-    if default_log_file.exists(): default_log_file.unlink()
+    specific_log_file = log_dir / "value_errors.log"
+    specific_log_file.unlink(missing_ok=True) # The logs directory is shared across this module
+    fake_stack("behavior_func")
 
-    with patch("src.dynel.exception_handling.inspect.stack") as mock_stack:
-        mock_caller_frame_tuple = (Mock(), "filename_mock", 123, func_name, ["code_line_mock"], 0)
-        mock_stack.return_value = [Mock(), mock_caller_frame_tuple]
+    def raise_and_handle():
         try:
-            raise error_to_raise
-        except KeyError as e:
+            raise ValueError("Mirrored VE from a thread")
+        except ValueError as e:
             handle_exception(config, e)
 
-    # Check main log for default metadata
-    primary_error_log = None
-    for rec in captured_logs:
-        if rec["level"].name == "ERROR" and "Exception caught in behavior_func" in rec["message"]:
-            primary_error_log = rec
-            break
-    assert primary_error_log is not None
-    assert primary_error_log["extra"]["default_applied"] is True
-    assert primary_error_log["extra"]["severity"] == "Low"
-    assert "error_code" not in primary_error_log["extra"] # Should not have VE001
-
-    # Check default specific log file
-    assert default_log_file.exists()
-    with open(default_log_file, 'r') as f:
-        default_log_content = f.read()
-
-    import json
-    lines = default_log_content.strip().split('\n')
-    assert len(lines) > 0
-    default_log_json = json.loads(lines[0])
-    assert "[Mirrored to " in default_log_json["message"]
-    assert "Test KeyError for default behavior" in default_log_json["exception"]["value"]
-    assert default_log_json["extra"]["default_applied"] is True
-
-
-def test_handle_exception_behavior_only_metadata_no_specific_log(config_with_behaviors, captured_logs, tmp_path):
-    config, log_dir = config_with_behaviors
-    error_to_raise = TypeError("Test TypeError for metadata only")
-    func_name = "behavior_func"
+    threads = [threading.Thread(target=raise_and_handle) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    dynel_logger_instance.complete()
 
-    # Ensure other specific log files are not created by this test
-    value_error_log = log_dir / "value_errors.log"
-    default_error_log = log_dir / "default_behavior_errors.log"
-    if value_error_log.exists(): value_error_log.unlink()
-    if default_error_log.exists(): default_error_log.unlink()
+    assert len(exception_handling_module._MIRROR_HANDLERS) == 1
+    assert len(specific_log_file.read_bytes().splitlines()) == 8
 
 
-    with patch("src.dynel.exception_handling.inspect.stack") as mock_stack:
-        mock_caller_frame_tuple = (Mock(), "filename_mock", 123, func_name, ["code_line_mock"], 0)
-        mock_stack.return_value = [Mock(), mock_caller_frame_tuple]
-        try:
-            raise error_to_raise
-        except TypeError as e:
-            handle_exception(config, e)
+def test_close_mirror_handlers_removes_handlers(config_with_behaviors, captured_logs, fake_stack):
+    config, _ = config_with_behaviors
+    fake_stack("behavior_func")
+    try:
+        raise ValueError("Mirrored VE before close")
+    except ValueError as e:
+        handle_exception(config, e)
+    (handler_id, _), = exception_handling_module._MIRROR_HANDLERS.values()
 
-    primary_error_log = None
-    for rec in captured_logs:
-        if rec["level"].name == "ERROR" and "Exception caught in behavior_func" in rec["message"]:
-            primary_error_log = rec
-            break
-    assert primary_error_log is not None
-    assert primary_error_log["extra"]["error_code"] == "TE001"
-    assert primary_error_log["extra"]["hint"] == "Check types"
-    assert "default_applied" not in primary_error_log["extra"] # Default metadata should not apply
+    close_mirror_handlers()
 
-    # Assert that no specific error log files were created for this TypeError
-    assert not value_error_log.exists()
-    assert not default_error_log.exists()
+    assert not exception_handling_module._MIRROR_HANDLERS
+    with pytest.raises(ValueError):
+        dynel_logger_instance.remove(handler_id)  # Already removed by close_mirror_handlers
 
 
 DUMMY_MODULE_WITH_CLASSES_CONTENT = """
@@ -471,79 +601,72 @@ class AnotherClass: # To ensure we iterate over multiple classes
 _module_private_var = 123
 """
 
+_DUMMY_WITH_CLASSES_CODE = compile(
+    DUMMY_MODULE_WITH_CLASSES_CONTENT, "<dummy_module_with_classes_for_dynel_test>", "exec"
+)
+
 @pytest.fixture
-def dummy_module_with_classes(tmp_path):
-    module_path = tmp_path / "dummy_module_with_classes_for_dynel_test.py"
-    module_path.write_text(DUMMY_MODULE_WITH_CLASSES_CONTENT)
-    spec = importlib.util.spec_from_file_location("dummy_module_with_classes_for_dynel_test", module_path)
-    imported_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(imported_module)
-    return imported_module
+def dummy_module_with_classes():
+    return _module_from_code("dummy_module_with_classes_for_dynel_test", _DUMMY_WITH_CLASSES_CODE)
 
 
-def test_module_exception_handler_wraps_class_methods(dynel_config_instance, dummy_module_with_classes, captured_logs):
+def test_module_exception_handler_wraps_class_methods(dynel_config_instance, dummy_module_with_classes, captured_logs, monkeypatch):
     config = dynel_config_instance
     # For this test, we only care that handle_exception is called, not its specific behavior here.
-    with patch("src.dynel.exception_handling.handle_exception") as mock_handle_exception:
-        module_exception_handler(config, dummy_module_with_classes)
-
-        # Test module-level functions
-        assert dummy_module_with_classes.module_level_func_good() == "module_good"
-        with pytest.raises(EnvironmentError, match="Bad environment at module level"):
-            dummy_module_with_classes.module_level_func_bad()
-        mock_handle_exception.assert_any_call(config, pytest.approx(EnvironmentError("Bad environment at module level"), abs=lambda x,y: type(x)==type(y) and x.args==y.args))
-
-        call_count_after_module = mock_handle_exception.call_count
-
-        # Test instance methods
-        instance = dummy_module_with_classes.MyTestClass(val=10)
-        assert instance.instance_method_good() == "instance_good_10"
-
-        instance_bad = dummy_module_with_classes.MyTestClass(val=-5)
-        with pytest.raises(ValueError, match="Negative value in instance_method_bad"):
-            instance_bad.instance_method_bad()
-        mock_handle_exception.assert_any_call(config, pytest.approx(ValueError("Negative value in instance_method_bad"), abs=lambda x,y: type(x)==type(y) and x.args==y.args))
-
-        call_count_after_instance = mock_handle_exception.call_count
-        assert call_count_after_instance > call_count_after_module
-
-        # Test static methods
-        assert dummy_module_with_classes.MyTestClass.static_method_good() == "static_good"
-        with pytest.raises(TypeError, match="Bad type in static_method_bad"):
-            dummy_module_with_classes.MyTestClass.static_method_bad()
-        mock_handle_exception.assert_any_call(config, pytest.approx(TypeError("Bad type in static_method_bad"), abs=lambda x,y: type(x)==type(y) and x.args==y.args))
-
-        call_count_after_static = mock_handle_exception.call_count
-        assert call_count_after_static > call_count_after_instance
-
-        # Test class methods
-        assert dummy_module_with_classes.MyTestClass.class_method_good() == "class_good_MyTestClass"
-        with pytest.raises(AttributeError, match="Bad attribute in class_method_bad for MyTestClass"):
-            dummy_module_with_classes.MyTestClass.class_method_bad()
-        mock_handle_exception.assert_any_call(config, pytest.approx(AttributeError("Bad attribute in class_method_bad for MyTestClass"), abs=lambda x,y: type(x)==type(y) and x.args==y.args))
-
-        call_count_after_class = mock_handle_exception.call_count
-        assert call_count_after_class > call_count_after_static
-
-        # Test another class
-        another_instance = dummy_module_with_classes.AnotherClass()
-        with pytest.raises(ZeroDivisionError, match="Dividing by zero in AnotherClass"):
-            another_instance.another_method_bad()
-        mock_handle_exception.assert_any_call(config, pytest.approx(ZeroDivisionError("Dividing by zero in AnotherClass"), abs=lambda x,y: type(x)==type(y) and x.args==y.args))
-
-        assert mock_handle_exception.call_count > call_count_after_class
-
-        # Ensure private module variables are not touched
-        assert dummy_module_with_classes._module_private_var == 123
-
-        # Ensure config.DEBUG_MODE = True would log wrapping details (visual check or more complex mock)
-        config.DEBUG_MODE = True
-        mock_logger_debug = MagicMock()
-        with patch("src.dynel.exception_handling.logger.debug", mock_logger_debug):
-             module_exception_handler(config, dummy_module_with_classes) # re-run with debug on
-
-        mock_logger_debug.assert_any_call("Wrapped function/staticmethod: %s in module %s", "module_level_func_good", "dummy_module_with_classes_for_dynel_test")
-        mock_logger_debug.assert_any_call("Wrapped method: %s.%s in module %s", "MyTestClass", "instance_method_good", "dummy_module_with_classes_for_dynel_test")
-        mock_logger_debug.assert_any_call("Wrapped method: %s.%s in module %s", "MyTestClass", "static_method_good", "dummy_module_with_classes_for_dynel_test")
-        mock_logger_debug.assert_any_call("Wrapped method: %s.%s in module %s", "MyTestClass", "class_method_good", "dummy_module_with_classes_for_dynel_test")
-        mock_logger_debug.assert_any_call("Wrapped method: %s.%s in module %s", "AnotherClass", "another_method_bad", "dummy_module_with_classes_for_dynel_test")
+    handled = _CallRecorder()
+    monkeypatch.setattr(exception_handling_module, "handle_exception", handled)
+    module_exception_handler(config, dummy_module_with_classes)
+
+    # Test module-level functions
+    assert dummy_module_with_classes.module_level_func_good() == "module_good"
+    with pytest.raises(EnvironmentError, match="Bad environment at module level"):
+        dummy_module_with_classes.module_level_func_bad()
+
+    # Test instance methods
+    instance = dummy_module_with_classes.MyTestClass(val=10)
+    assert instance.instance_method_good() == "instance_good_10"
+
+    instance_bad = dummy_module_with_classes.MyTestClass(val=-5)
+    with pytest.raises(ValueError, match="Negative value in instance_method_bad"):
+        instance_bad.instance_method_bad()
+
+    # Test static methods
+    assert dummy_module_with_classes.MyTestClass.static_method_good() == "static_good"
+    with pytest.raises(TypeError, match="Bad type in static_method_bad"):
+        dummy_module_with_classes.MyTestClass.static_method_bad()
+
+    # Test class methods
+    assert dummy_module_with_classes.MyTestClass.class_method_good() == "class_good_MyTestClass"
+    with pytest.raises(AttributeError, match="Bad attribute in class_method_bad for MyTestClass"):
+        dummy_module_with_classes.MyTestClass.class_method_bad()
+
+    # Test another class
+    another_instance = dummy_module_with_classes.AnotherClass()
+    with pytest.raises(ZeroDivisionError, match="Dividing by zero in AnotherClass"):
+        another_instance.another_method_bad()
+
+    # Each failing call reaches handle_exception exactly once, in order, with the raised error
+    assert all(handled_config is config for handled_config, _ in handled.calls)
+    assert [(type(err), err.args) for _, err in handled.calls] == [
+        (OSError, ("Bad environment at module level",)),
+        (ValueError, ("Negative value in instance_method_bad",)),
+        (TypeError, ("Bad type in static_method_bad",)),
+        (AttributeError, ("Bad attribute in class_method_bad for MyTestClass",)),
+        (ZeroDivisionError, ("Dividing by zero in AnotherClass",)),
+    ]
+
+    # Ensure private module variables are not touched
+    assert dummy_module_with_classes._module_private_var == 123
+
+    # Ensure config.DEBUG_MODE = True logs wrapping details
+    config.DEBUG_MODE = True
+    logged_debug = _CallRecorder()
+    monkeypatch.setattr(exception_handling_module.logger, "debug", logged_debug)
+    module_exception_handler(config, dummy_module_with_classes) # re-run with debug on
+
+    seen = set(logged_debug.calls)
+    assert ("Wrapped function/staticmethod: %s in module %s", "module_level_func_good", "dummy_module_with_classes_for_dynel_test") in seen
+    assert ("Wrapped method: %s.%s in module %s", "MyTestClass", "instance_method_good", "dummy_module_with_classes_for_dynel_test") in seen
+    assert ("Wrapped method: %s.%s in module %s", "MyTestClass", "static_method_good", "dummy_module_with_classes_for_dynel_test") in seen
+    assert ("Wrapped method: %s.%s in module %s", "MyTestClass", "class_method_good", "dummy_module_with_classes_for_dynel_test") in seen
+    assert ("Wrapped method: %s.%s in module %s", "AnotherClass", "another_method_bad", "dummy_module_with_classes_for_dynel_test") in seen
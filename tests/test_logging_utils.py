@@ -1,178 +1,152 @@
+import types
+
 import pytest
-import json
-from pathlib import Path
-from unittest.mock import patch, Mock, call
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+from unittest.mock import Mock, call
 
 # Importing from the new locations in src.dynel
 from src.dynel.config import DynelConfig
+from src.dynel import logging_utils as logging_utils_module
 from src.dynel.logging_utils import configure_logging
-# For test_log_file_output_formats, we also need handle_exception
+# For the log file output tests, we also need handle_exception
+from src.dynel import exception_handling as exception_handling_module
 from src.dynel.exception_handling import handle_exception
 # Import the actual logger instance for direct manipulation in tests if needed
 from loguru import logger as dynel_logger_instance # Renamed to avoid clash
-from typing import Optional # Added Optional
 
 
+# --- Tests for configure_logging ---
+
 @pytest.fixture
-def dynel_config_instance(): # Copied from test_config.py for standalone use here if needed
-    """Returns a default DynelConfig instance."""
-    return DynelConfig()
+def mock_loguru_logger(monkeypatch):
+    """
+    Swaps the logger used by logging_utils for a Mock whose add() returns handler id 1,
+    starting from an empty list of tracked handler ids.
+    """
+    mock_logger = Mock()
+    mock_logger.add.return_value = 1
+    monkeypatch.setattr(logging_utils_module, "logger", mock_logger)
+    monkeypatch.setattr(logging_utils_module, "_tracked_handler_ids", [])
+    return mock_logger
 
-# --- Tests for configure_logging ---
 
-@patch("src.dynel.logging_utils.logger") # Patch logger in logging_utils.py
-def test_configure_logging_debug_mode(mock_loguru_logger, dynel_config_instance):
-    dynel_config_instance.DEBUG_MODE = True
-    
-    # Mock logger.add() to return a handler id
-    mock_loguru_logger.add.return_value = 1
+@pytest.mark.parametrize("debug_mode, expected_level", [(True, "DEBUG"), (False, "INFO")])
+def test_configure_logging_levels(dynel_config_instance, mock_loguru_logger, debug_mode, expected_level):
+    dynel_config_instance.DEBUG_MODE = debug_mode
     
     configure_logging(dynel_config_instance)
     
     # First call will have no tracked handlers, so remove shouldn't be called
     assert mock_loguru_logger.remove.call_count == 0
-    args_list = mock_loguru_logger.add.call_args_list
-    assert any(
-        call[1].get("sink") == "dynel.log" and call[1].get("level") == "DEBUG"
-        for call in args_list
-    )
-    assert any(
-        call[1].get("sink") == "dynel.json" and call[1].get("level") == "DEBUG" # also check level for json
-        for call in args_list
-    )
+    sinks = {kwargs.get("sink"): kwargs for _, kwargs in mock_loguru_logger.add.call_args_list}
+    assert sinks["dynel.log"]["level"] == expected_level
+    assert sinks["dynel.json"]["level"] == expected_level # also check level for json
+    assert sinks["dynel.json"]["serialize"] is True
 
-
-@patch("src.dynel.logging_utils.logger") # Patch logger in logging_utils.py
-def test_configure_logging_production_mode(mock_loguru_logger, dynel_config_instance):
-    dynel_config_instance.DEBUG_MODE = False
-    
-    # Mock logger.add() to return a handler id
-    mock_loguru_logger.add.return_value = 1
-    
-    # Call configure_logging twice to test handler removal
-    configure_logging(dynel_config_instance)
+    # Second call should remove the two handlers from the first call
     configure_logging(dynel_config_instance)
-    
-    # Second call should remove two handlers (from first call)
     mock_loguru_logger.remove.assert_has_calls([call(1), call(1)])
-    args_list = mock_loguru_logger.add.call_args_list
-    assert any(
-        call[1].get("sink") == "dynel.log" and call[1].get("level") == "INFO"
-        for call in args_list
-    )
-    assert any(
-        call[1].get("sink") == "dynel.json" and call[1].get("level") == "INFO" # also check level for json
-        for call in args_list
-    )
 
-# --- Helper for log file tests ---
-def _find_log_record_by_function(json_log_content: str, function_name: str) -> Optional[dict]:
-    """
-    Parses a string of JSON log entries (one JSON object per line) and
-    returns the first log record originating from the specified function.
-    """
-    for line in json_log_content.strip().split("\n"):
-        if not line:
-            continue
-        try:
-            parsed_line = json.loads(line)
-            # The structure might be {"record": ..., "text": ...} or just the record itself
-            # based on how Loguru serializes. Assuming "record" key for now.
-            # If direct serialization, then parsed_line is the record.
-            record = parsed_line.get("record", parsed_line) # Adjust if structure differs
-            if record.get("function") == function_name:
-                return record
-        except json.JSONDecodeError:
-            continue
-    return None
 
+def test_configure_logging_closes_mirror_handlers(dynel_config_instance, mock_loguru_logger, monkeypatch):
+    close_mirrors = Mock()
+    monkeypatch.setattr(logging_utils_module, "close_mirror_handlers", close_mirrors)
+
+    configure_logging(dynel_config_instance)
+
+    close_mirrors.assert_called_once_with()
 
 # --- Tests for Log File Output ---
 
-def test_log_file_output_formats(tmp_path, monkeypatch):
+@pytest.fixture(scope="module")
+def logged_index_error(tmp_path_factory):
+    """
+    Configures the text and JSON file sinks, handles one IndexError through
+    them and returns what the tests below inspect. Runs once per module.
+    """
     config = DynelConfig(context_level="med")
 
-    log_file_txt = tmp_path / "output.log"
-    log_file_json = tmp_path / "output.json"
+    log_dir = tmp_path_factory.mktemp("log_output")
+    log_file_txt = log_dir / "output.log"
+    log_file_json = log_dir / "output.json"
 
     # Configure logging using our configure_logging function
     config.DEBUG_MODE = True
     configure_logging(config, str(log_file_txt), str(log_file_json))
+    sink_ids = list(logging_utils_module._tracked_handler_ids)
+    # Capture records in memory for the structured assertions
+    json_records = []
+    capture_id = dynel_logger_instance.add(lambda message: json_records.append(message.record), level="DEBUG")
 
-
-    error_to_raise = IndexError("Test index out of bounds")
     func_name = "function_writing_to_log_files"
+    caller_frame = types.SimpleNamespace(
+        f_code=types.SimpleNamespace(co_name=func_name),
+        f_locals={"alpha": 1, "beta": "two"},
+    )
 
-    mock_caller_frame_obj_for_log_test = Mock()
-    mock_caller_frame_obj_for_log_test.f_locals = {"alpha": 1, "beta": "two"}
-
-    # Patch inspect within the exception_handling module
-    with patch("src.dynel.exception_handling.inspect") as mock_dynel_inspect:
-        mock_caller_frame_info_tuple_for_log_test = (
-            mock_caller_frame_obj_for_log_test,
-            "test_file.py",
-            100,
-            func_name,
-            ["some_code"],
-            0,
-        )
-        mock_dynel_inspect.stack.return_value = [
-            Mock(),
-            mock_caller_frame_info_tuple_for_log_test
-        ]
-
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(exception_handling_module, "_getframe", lambda depth=0: caller_frame)
         try:
-            raise error_to_raise
+            raise IndexError("Test index out of bounds")
         except IndexError as e:
             handle_exception(config, e) # This uses the globally configured logger (dynel_logger_instance)
+    # The file sinks are enqueued; wait for their writer threads before reading
+    dynel_logger_instance.complete()
+    dynel_logger_instance.remove(capture_id)
+
+    yield types.SimpleNamespace(
+        func_name=func_name,
+        log_file_txt=log_file_txt,
+        log_file_json=log_file_json,
+        records=json_records,
+    )
 
-    # Verify text log content
-    assert log_file_txt.exists()
-    txt_content = log_file_txt.read_text()
-    assert "ERROR" in txt_content
-    assert f"{func_name}" in txt_content # func_name is from the perspective of handle_exception's caller
-    assert "Exception caught in" in txt_content
-    assert "IndexError: Test index out of bounds" in txt_content
-    assert "'alpha': 1" in txt_content
-    assert "'beta': 'two'" in txt_content
-    assert "timestamp" in txt_content
-
-    # Verify JSON log content
-    assert log_file_json.exists()
-    json_content = log_file_json.read_text(encoding='utf-8')
-    # The _find_log_record_by_function was designed for records nested under "record".
-    # Loguru's direct JSON output might be different. Let's try parsing the first line.
-
-    log_entry = None
-    for line in json_content.strip().split("\n"):
-        if line:
-            parsed_line = json.loads(line)
-            # Check if this is the record for handle_exception
-            # The 'function' field in the record should be 'handle_exception'
-            # The 'message' field will contain 'func_name'
-            if parsed_line.get("record", {}).get("function") == "handle_exception" and \
-               func_name in parsed_line.get("record", {}).get("message", ""):
-                log_entry = parsed_line["record"]
-                break
-            # Fallback for simpler JSON structure (older Loguru or custom config)
-            elif parsed_line.get("function") == "handle_exception" and \
-                 func_name in parsed_line.get("message", ""):
-                 log_entry = parsed_line
-                 break
-
-    assert log_entry is not None, f"Log entry from handle_exception (caller {func_name}) not found in JSON log"
-    assert log_entry["level"]["name"] == "ERROR"
+    # Remove only this fixture's sinks; other modules' session sinks stay registered
+    for handler_id in sink_ids:
+        dynel_logger_instance.remove(handler_id)
+    logging_utils_module._tracked_handler_ids.clear()
+
+
+def test_log_file_structured_record(logged_index_error):
+    func_name = logged_index_error.func_name
+
+    log_entry = next(
+        (record for record in logged_index_error.records if record["function"] == "handle_exception"),
+        None,
+    )
+    assert log_entry is not None, f"Log entry from handle_exception (caller {func_name}) not captured"
+    assert log_entry["level"].name == "ERROR"
     assert f"Exception caught in {func_name}" in log_entry["message"]
 
     exception_details = log_entry["exception"]
-    assert exception_details["type"] == "IndexError"
-    assert "Test index out of bounds" in exception_details["value"]
-    assert exception_details["traceback"]
+    assert exception_details.type is IndexError
+    assert "Test index out of bounds" in str(exception_details.value)
+    assert exception_details.traceback is not None
 
     extra_details = log_entry["extra"]
     assert "timestamp" in extra_details
-    assert "'alpha': 1" in extra_details["local_vars"]  # Stringified dict
-    assert "'beta': 'two'" in extra_details["local_vars"]  # Stringified dict
+    assert extra_details["local_vars"]["alpha"] == "1"
+    assert extra_details["local_vars"]["beta"] == "'two'"
+
+
+def test_log_file_text_sink(logged_index_error):
+    # The structured record carries the semantic checks; the text sink only needs to have received it
+    log_file_txt = logged_index_error.log_file_txt
+    assert log_file_txt.exists()
+    txt_content = log_file_txt.read_text()
+    assert "ERROR" in txt_content
+    assert logged_index_error.func_name in txt_content
 
-    # Clean up global logger state
-    dynel_logger_instance.remove()
+
+def test_log_file_json_sink(logged_index_error):
+    log_file_json = logged_index_error.log_file_json
+    assert log_file_json.exists()
+    # handle_exception emits the last record written, so only the final line is parsed
+    json_data = log_file_json.read_bytes().rstrip(b"\n")
+    serialized_entry = _loads(json_data[json_data.rfind(b"\n") + 1:])["record"]
+    assert serialized_entry["function"] == "handle_exception"
+    assert serialized_entry["level"]["name"] == "ERROR"
+    assert serialized_entry["exception"]["type"] == "IndexError"